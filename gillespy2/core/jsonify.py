@@ -19,15 +19,96 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import re
 import copy
 import json
+import base64
 import pydoc
 import hashlib
+import functools
+import importlib
 
 from json import JSONEncoder
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 import numpy
 import gillespy2
 
+# The digests compared by __eq__ never leave the process, so any hash will do. Prefer BLAKE3's
+# vectorized implementation when it is installed. get_json_hash() always uses MD5, as its
+# value may be persisted and compared by callers.
+try:
+    from blake3 import blake3 as _eq_hash_fn
+
+except ImportError:
+    _eq_hash_fn = hashlib.md5
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Immutable types which can be shared between an object and its clone.
+_ATOMIC_TYPES = frozenset({str, int, float, bool, complex, bytes, frozenset, type(None), type})
+
+# Attributes which are never copied from an object into its JSON representation. '_type' is
+# re-added by the encoder, and decoded objects carry it in their backing __dict__.
+_UNENCODED_KEYS = frozenset({"_type"})
+
+# Encoded '_type' strings, keyed by the class of the encoded object.
+_TYPE_STR_CACHE = {}
+
+# Resolved decode types, keyed by their dotted name. Values are (type, is_jsonify) tuples.
+_TYPE_CACHE = {}
+
+def _canonicalize(obj: object) -> object:
+    """
+    Rebuild the plain dicts within obj with their keys in sorted order. The encoders emit dicts in
+    insertion order, so this replaces the need for 'sort_keys=True' when the result is encoded.
+    Jsonify objects are left as-is, as they are canonicalized when ComplexJsonCoder.default() encodes them.
+
+    :param obj: The object to canonicalize.
+    :type obj: object
+
+    :returns: The canonical form of obj.
+    """
+
+    if isinstance(obj, dict):
+        return {key: _canonicalize(val) for key, val in sorted(obj.items())}
+
+    if isinstance(obj, (list, tuple)):
+        return [_canonicalize(val) for val in obj]
+
+    return obj
+
+@functools.lru_cache(maxsize=256)
+def _locate(path: str) -> object:
+    """
+    Memoized pydoc.locate(). Unlike _resolve_type(), this also resolves builtins (e.g. 'int').
+    """
+    return pydoc.locate(path)
+
+def _resolve_type(type_name: str) -> "Tuple[Optional[type], bool]":
+    """
+    Resolve a dotted type name (e.g. 'gillespy2.core.model.Model') into its type. Successful lookups
+    are cached so that repeated decodes of the same type are a single dict lookup.
+
+    :param type_name: The fully qualified name of the type.
+    :type type_name: str
+
+    :returns: A tuple of the resolved type (None if it does not exist) and whether it subclasses Jsonify.
+    """
+
+    resolved = _TYPE_CACHE.get(type_name)
+    if resolved is not None:
+        return resolved
+
+    module_name, _, class_name = type_name.rpartition(".")
+    try:
+        obj_type = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError, ValueError):
+        return None, False
+
+    resolved = (obj_type, isinstance(obj_type, type) and issubclass(obj_type, Jsonify))
+    _TYPE_CACHE[type_name] = resolved
+
+    return resolved
+
 class Jsonify:
     """
     Interface to allow for instances of arbitrary types to be encoded into json strings
@@ -47,8 +128,9 @@ class Jsonify:
         """
 
         encoder = ComplexJsonCoder(encode_private=encode_private)
+
         try:
-            return json.dumps(copy.deepcopy(self), indent=4, sort_keys=True, default=encoder.default)
+            return json.dumps(self, indent=4, default=encoder.default)
         except TypeError:
             return None
 
@@ -64,10 +146,20 @@ class Jsonify:
         :returns: A decoded object.
         """
 
+        json_type = type(json_str)
+
         # If the json_str is actually a dict, it means we've decoded as much as possible.
         if isinstance(json_str, dict):
             return cls.from_dict(json_str)
 
+        # Already decoded scalars need no further decoding.
+        if json_type in (int, float, bool) or json_str is None:
+            return json_str
+
+        # Already decoded arrays only need their dicts decoded; their other items are already decoded values.
+        if isinstance(json_str, (list, tuple)):
+            return [cls.from_dict(item) if isinstance(item, dict) else item for item in json_str]
+
         decoder = ComplexJsonCoder()
         return json.loads(json_str, object_hook=decoder.decode)
 
@@ -100,19 +192,103 @@ class Jsonify:
 
         return new
 
+    @classmethod
+    def _from_trusted_dict(cls, src_dict: dict) -> object:
+        """
+        Same as from_dict(), but src_dict is adopted as the new instance's backing __dict__ without
+        being copied. Only use this when src_dict is not shared, e.g. when it was just created by json.loads.
+
+        :param src_dict: The dictionary to adopt as the backing __dict__ of the new instance.
+        :type src_dict: dict
+
+        :returns: A new object with its backing __dict__ set to src_dict.
+        """
+
+        new = cls.__new__(cls)
+        new.__dict__ = src_dict
+
+        return new
+
+    @classmethod
+    def _uses_default_decode(cls) -> bool:
+        """
+        :returns: True if this type decodes through the default from_json() and from_dict() implementations.
+        """
+
+        return (getattr(cls.from_json, "__func__", None) is Jsonify.from_json.__func__
+                and getattr(cls.from_dict, "__func__", None) is Jsonify.from_dict.__func__)
+
     def to_anon(self):
         """
         Converts self into an anonymous instance of self.
         """
 
-        return self.get_translation_table().obj_to_anon(copy.deepcopy(self))
+        return self.get_translation_table().obj_to_anon(Jsonify._fast_clone(self))
 
     def to_named(self):
         """
         Converts self into a named instance of self.
         """
 
-        return self.get_translation_table().obj_to_named(copy.deepcopy(self))
+        return self.get_translation_table().obj_to_named(Jsonify._fast_clone(self))
+
+    @staticmethod
+    def _fast_clone(obj: object, memo: dict = None) -> object:
+        """
+        Recursively clone an object tree made up of Jsonify nodes, containers, ndarrays, and atomic types.
+        This is a specialized replacement for copy.deepcopy(); immutable values are returned as-is
+        and only mutable nodes are tracked in the memo.
+
+        :param obj: The object to clone.
+        :type obj: object
+
+        :param memo: A map of id(original) to clone, used to preserve shared references.
+        :type memo: dict
+
+        :returns: A deep clone of obj.
+        """
+
+        obj_type = type(obj)
+
+        if obj_type in _ATOMIC_TYPES:
+            return obj
+
+        if memo is None:
+            memo = {}
+
+        obj_id = id(obj)
+        if obj_id in memo:
+            return memo[obj_id]
+
+        if obj_type is dict or obj_type is OrderedDict:
+            new = obj_type()
+            memo[obj_id] = new
+            for key, val in obj.items():
+                new[Jsonify._fast_clone(key, memo)] = Jsonify._fast_clone(val, memo)
+
+        elif obj_type is list:
+            new = []
+            memo[obj_id] = new
+            new.extend([Jsonify._fast_clone(item, memo) for item in obj])
+
+        elif obj_type is tuple:
+            new = tuple([Jsonify._fast_clone(item, memo) for item in obj])
+            memo[obj_id] = new
+
+        elif obj_type is numpy.ndarray:
+            new = obj.copy()
+            memo[obj_id] = new
+
+        elif isinstance(obj, Jsonify):
+            new = obj_type.__new__(obj_type)
+            memo[obj_id] = new
+            new.__dict__ = Jsonify._fast_clone(obj.__dict__, memo)
+
+        else:
+            # Unknown types (sets, numpy scalars, etc.) defer to the standard library.
+            new = copy.deepcopy(obj, memo)
+
+        return new
 
     def get_translation_table(self) -> "TranslationTable":
         """
@@ -141,7 +317,8 @@ class Jsonify:
 
         :returns: A dictionary containing all public ('_'-prefixed) variables on the object.
         """
-        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+        obj_vars = self.__dict__
+        return {k: obj_vars[k] for k in obj_vars if k[:1] != "_"}
 
     def get_json_hash(self, ignore_whitespace=True, hash_private_vals=False) -> Optional[str]:
         """
@@ -158,17 +335,41 @@ class Jsonify:
         :returns: An MD5 hash of the object's sorted JSON representation.
         """
 
-        # If _hash_private_vars is set, hash ALL properties on the object.
-        model_json = self.to_json(encode_private=hash_private_vals)
+        json_digest = self._json_digest(hashlib.md5, ignore_whitespace=ignore_whitespace,
+                                        hash_private_vals=hash_private_vals)
+        if json_digest is None:
+            return None
 
-        # If ignore_whitespace is set, strip out all whitespace characters.
+        return json_digest.hex()
+
+    def _json_digest(self, hash_fn, ignore_whitespace=True, hash_private_vals=False) -> Optional[bytes]:
+        """
+        Get the raw digest of the json representation of self, computed with hash_fn. See get_json_hash().
+
+        :returns: The digest bytes, or None if self could not be encoded.
+        """
+
+        # If ignore_whitespace is set the JSON is emitted compactly and any remaining
+        # whitespace is stripped chunk by chunk, which yields the same digest as
+        # stripping the indented JSON string.
         if ignore_whitespace:
-            try:
-                model_json = re.sub(r"\s+", "", model_json)
-            except TypeError:
-                return None
+            encoder = ComplexJsonCoder(encode_private=hash_private_vals, separators=(",", ":"))
+        else:
+            encoder = ComplexJsonCoder(encode_private=hash_private_vals, indent=4)
+
+        # Stream the encoded chunks directly into the digest rather than building
+        # (and copying) the full JSON string in memory.
+        json_hash = hash_fn()
+        try:
+            for chunk in encoder.iterencode(self):
+                if ignore_whitespace:
+                    chunk = _WHITESPACE_RE.sub("", chunk)
+
+                json_hash.update(chunk.encode("utf-8"))
+        except TypeError:
+            return None
 
-        return hashlib.md5(str.encode(model_json)).hexdigest()
+        return json_hash.digest()
 
     def __eq__(self, o: "Jsonify"):
         """
@@ -180,7 +381,11 @@ class Jsonify:
 
         :returns: True if equal, False if not.
         """
-        return self.get_json_hash() == o.get_json_hash()
+        if self is o:
+            return True
+
+        # Compare the raw digests rather than their hex representations.
+        return isinstance(o, Jsonify) and self._json_digest(_eq_hash_fn) == o._json_digest(_eq_hash_fn)
 
 class ComplexJsonCoder(JSONEncoder):
     """
@@ -203,6 +408,7 @@ class ComplexJsonCoder(JSONEncoder):
         self._delegation_table = {
             numpy.ndarray: NdArrayCoder,
             set: SetCoder,
+            frozenset: SetCoder,
             type: TypeCoder
         }
 
@@ -214,35 +420,55 @@ class ComplexJsonCoder(JSONEncoder):
         :param o: The object that is currently being encoded into JSON.
         """
 
-        # If o is of matching type, use a custom coder.
-        for obj_type, coder in self._delegation_table.items():
-            if isinstance(o, obj_type):
-                return coder.to_dict(o)
+        # If o is of matching type, use a custom coder. Exact type matches are resolved with a
+        # single lookup; subclasses of the delegated types fall back to isinstance checks.
+        # Coders emit their keys in sorted order, as the encoders do not sort keys.
+        coder = self._delegation_table.get(type(o))
+        if coder is not None:
+            return coder.to_dict(o)
 
         if not isinstance(o, Jsonify):
+            for obj_type, coder in self._delegation_table.items():
+                if isinstance(o, obj_type):
+                    return coder.to_dict(o)
+
             return super().default(o)
 
-        if self._encode_private:
-            model = o.to_dict()
+        obj_class = o.__class__
+        type_str = _TYPE_STR_CACHE.get(obj_class)
 
-        else:
-            # Strip private variables from the object.
-            model = {}
+        if type_str is None:
+            # If the model is some subclass of gillespy2.core.model.Model, then manually set its type.
+            if issubclass(obj_class, gillespy2.core.Model):
+                type_str = f"{gillespy2.core.Model.__module__}.{gillespy2.core.Model.__name__}"
+
+            else:
+                type_str = f"{obj_class.__module__}.{obj_class.__name__}"
 
-            for key, val in o.to_dict().items():
-                if key.startswith("_") and not key.startswith("__"):
-                    continue
+            _TYPE_STR_CACHE[obj_class] = type_str
 
-                model[key] = val
+        # The canonical dict built below is always new, so the default to_dict() copy of the
+        # backing __dict__ can be skipped.
+        if obj_class.to_dict is Jsonify.to_dict:
+            obj_vars = vars(o)
+        else:
+            obj_vars = o.to_dict()
 
-        # If the model is some subclass of gillespy2.core.model.Model, then manually set its type.
-        if issubclass(o.__class__, gillespy2.core.Model):
-            model["_type"] = f"{gillespy2.core.Model.__module__}.{gillespy2.core.Model.__name__}"
+        if self._encode_private:
+            items = [(key, val) for key, val in obj_vars.items() if key not in _UNENCODED_KEYS]
 
         else:
-            model["_type"] = f"{o.__class__.__module__}.{o.__class__.__name__}"
+            # Strip private variables from the object.
+            items = [
+                (key, val) for key, val in obj_vars.items()
+                if key[:1] != "_" or key[:2] == "__"
+            ]
+
+        items.append(("_type", type_str))
 
-        return model
+        # Emit the keys in sorted order so that the JSON representation (and therefore its hash)
+        # is independent of attribute and insertion order.
+        return {key: _canonicalize(val) for key, val in sorted(items)}
 
     def decode(self, json_dict: dict):
         """
@@ -259,16 +485,21 @@ class ComplexJsonCoder(JSONEncoder):
         if "_type" not in json_dict:
             return json_dict
 
-        json_type = pydoc.locate(json_dict["_type"])
+        json_type, is_jsonify = _resolve_type(json_dict["_type"])
 
         if json_type is None:
-            raise Exception(f"{json_type} does not exist.")
+            raise Exception(f"{json_dict['_type']} does not exist.")
 
         # If the type is not a subclass of Jsonify, throw an exception.
         # We do this to prevent the execution of arbitrary code.
-        if not issubclass(json_type, Jsonify):
+        if not is_jsonify:
             raise Exception(f"{json_type}")
 
+        # json_dict was just created by json.loads and is not shared, so types which rely on
+        # the default decode behavior can adopt it directly instead of copying it.
+        if json_type._uses_default_decode():
+            return json_type._from_trusted_dict(json_dict)
+
         return json_type.from_json(json_dict)
 
 class TranslationTable(Jsonify):
@@ -283,7 +514,58 @@ class TranslationTable(Jsonify):
 
     def __init__(self, to_anon: "dict[str, str]"):
         self.to_anon = to_anon.copy()
-        self.to_named = dict((v, k) for k, v in list(self.to_anon.items()))
+        self.to_named = {v: k for k, v in self.to_anon.items()}
+
+        self._anon_re = self._compile_translation_regex(self.to_anon)
+        self._named_re = self._compile_translation_regex(self.to_named)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the table into a dictionary ready for json encoding. The compiled translation
+        expressions are derived state and are not encoded.
+
+        :returns: The backing var dictionary of the table, without its compiled expressions.
+        """
+
+        return {k: v for k, v in vars(self).items() if k not in ("_anon_re", "_named_re")}
+
+    @staticmethod
+    def _compile_translation_regex(translation_table: "dict[str, str]") -> "Optional[re.Pattern]":
+        """
+        Compile a single expression which matches any complete identifier in the translation table.
+        Keys are ordered longest-first so that a key is never shadowed by one of its prefixes.
+
+        :param translation_table: The mapping the expression will translate by.
+        :type translation_table: dict[str, str]
+
+        :returns: The compiled expression, or None if the table contains no identifiers.
+        """
+
+        # Only identifiers can be matched as complete tokens. The lookarounds exclude tokens embedded
+        # within longer identifiers or numeric literals (e.g. the 'e5' in '1e5').
+        keys = sorted((key for key in translation_table if key.isidentifier()), key=len, reverse=True)
+        if len(keys) == 0:
+            return None
+
+        return re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, keys)) + r")(?!\w)")
+
+    def _get_translation_regex(self, translation_table: "dict[str, str]") -> "Optional[re.Pattern]":
+        """
+        Get the compiled expression for one of this table's mappings. Expressions are compiled
+        lazily for tables which were decoded from JSON, and never cached for foreign mappings.
+        """
+
+        if translation_table is self.to_anon:
+            attr = "_anon_re"
+        elif translation_table is self.to_named:
+            attr = "_named_re"
+        else:
+            return self._compile_translation_regex(translation_table)
+
+        if attr not in self.__dict__:
+            self.__dict__[attr] = self._compile_translation_regex(translation_table)
+
+        return self.__dict__[attr]
 
     def obj_to_anon(self, obj: object):
         """
@@ -322,10 +604,10 @@ class TranslationTable(Jsonify):
         """
 
         # If a translation table exists on the object, remove and save it.
-        if "_translation_table" in obj.__dict__:
-            saved_table = obj.__dict__.pop("_translation_table")
+        saved_table = obj.__dict__.pop("_translation_table", None)
 
-        translated = self._recursive_translate(obj, translation_table)
+        translation_regex = self._get_translation_regex(translation_table)
+        translated = self._recursive_translate(obj, translation_table, translation_regex)
 
         # Restore the original translation table, if needed.
         if saved_table is not None:
@@ -333,57 +615,73 @@ class TranslationTable(Jsonify):
 
         return translated
 
-    def _recursive_translate(self, obj: object, translation_table: "dict[str, str]"):
+    def _recursive_translate(self, obj: object, translation_table: "dict[str, str]",
+                             translation_regex: "Optional[re.Pattern]"):
         # The obj is a class if it's an instance of Jsonify. Class property names *cannot*
         # be changed, so translate just the values.
         if isinstance(obj, Jsonify):
-            for key in vars(obj).keys():
-                vars(obj)[key] = self._recursive_translate(vars(obj)[key], translation_table)
+            obj_vars = obj.__dict__
+            for key, val in obj_vars.items():
+                # Only write back values that changed; untranslated strings are returned as-is.
+                translated = self._recursive_translate(val, translation_table, translation_regex)
+                if translated is not val:
+                    obj_vars[key] = translated
 
         elif isinstance(obj, list):
-            for item in obj:
-                item = self._recursive_translate(item, translation_table)
+            obj = [self._recursive_translate(item, translation_table, translation_regex) for item in obj]
 
-        elif isinstance(obj, dict):
-            # Convert the dictionary into a list of tuples.
-            # This makes it easier to modify key names.
-            obj = list((k, v) for k, v in obj.items())
-            new_pairs = [ ]
-
-            for pair in obj:
-                new_pairs.append((
-                    self._recursive_translate(pair[0], translation_table),
-                    self._recursive_translate(pair[1], translation_table)
-                ))
+        elif isinstance(obj, tuple):
+            obj = tuple([self._recursive_translate(item, translation_table, translation_regex) for item in obj])
 
-            obj = dict((x[0], x[1]) for x in new_pairs)
+        elif isinstance(obj, dict):
+            # Keys are translated as well as values, so the dictionary is rebuilt.
+            obj = {
+                self._recursive_translate(key, translation_table, translation_regex):
+                    self._recursive_translate(val, translation_table, translation_regex)
+                for key, val in obj.items()
+            }
 
         # If the obj is a string, translate it via a regex replace.
         # Note: mathematical functions contain additional characters that should not be translated.
         elif isinstance(obj, str):
-            # To handle functions, grab all complete words from the string.
-            matches = re.finditer("([0-z])+", obj)
-
-            # For each match, translate the group.
-            for match in matches:
-                group = match.group()
-                obj = obj.replace(group, translation_table.get(group, group))
+            # Translate each complete identifier found in the table in a single pass. Matching
+            # whole tokens avoids clobbering tokens that contain another token.
+            if translation_regex is not None:
+                obj = translation_regex.sub(lambda match: translation_table[match.group()], obj)
 
         return obj
 
 class NdArrayCoder(Jsonify):
     """ This JSON coder enables support for  the `numpy.ndarray` type. """
 
+    # Numeric dtype kinds which are encoded as base64 raw bytes: boolean, (un)signed integer, float and complex.
+    _RAW_KINDS = frozenset("biufc")
+
     @staticmethod
     def to_dict(obj):
+        # Object and string arrays cannot be reinterpreted from raw bytes, so they are encoded as nested lists.
+        if obj.dtype.kind not in NdArrayCoder._RAW_KINDS:
+            return {
+                "_type": f"{NdArrayCoder.__module__}.{NdArrayCoder.__name__}",
+                "data": obj.tolist()
+            }
+
         return {
-            "data": obj.tolist(),
-            "_type": f"{NdArrayCoder.__module__}.{NdArrayCoder.__name__}"
+            "_type": f"{NdArrayCoder.__module__}.{NdArrayCoder.__name__}",
+            "data": base64.b64encode(numpy.ascontiguousarray(obj).tobytes()).decode("ascii"),
+            "dtype": obj.dtype.str,
+            "shape": list(obj.shape)
         }
 
     @staticmethod
     def from_json(obj):
-        return numpy.array(obj["data"])
+        # Arrays encoded as nested lists, including those written by older versions of GillesPy2.
+        if isinstance(obj["data"], list):
+            return numpy.array(obj["data"])
+
+        # The bytearray keeps the decoded array writable without an additional copy.
+        data = bytearray(base64.b64decode(obj["data"]))
+        return numpy.frombuffer(data, dtype=numpy.dtype(obj["dtype"])).reshape(obj["shape"])
 
 class SetCoder(Jsonify):
     """ This JSON coder enables support for the `set` type. """
@@ -391,8 +689,8 @@ class SetCoder(Jsonify):
     @staticmethod
     def to_dict(obj):
         return {
-            "data": list(obj),
-            "_type": f"{SetCoder.__module__}.{SetCoder.__name__}"
+            "_type": f"{SetCoder.__module__}.{SetCoder.__name__}",
+            "data": list(obj)
         }
 
     @staticmethod
@@ -405,10 +703,10 @@ class TypeCoder(Jsonify):
     @staticmethod
     def to_dict(obj):
         return {
-            "data": type(obj),
-            "_type": f"{TypeCoder.__module__}.{TypeCoder.__name__}"
+            "_type": f"{TypeCoder.__module__}.{TypeCoder.__name__}",
+            "data": type(obj)
         }
 
     @staticmethod
     def from_json(obj):
-        return pydoc.locate(obj["data"])
+        return _locate(obj["data"])
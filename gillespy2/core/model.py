@@ -19,15 +19,34 @@ import gillespy2
 from gillespy2.core.jsonify import TranslationTable
 from gillespy2.core.reaction import *
 from gillespy2.core.raterule import RateRule
-from gillespy2.core.parameter import Parameter
+from gillespy2.core.assignmentrule import AssignmentRule
+from gillespy2.core.parameter import Parameter, _compile_expression
 from gillespy2.core.species import Species
 from gillespy2.core.reaction import Reaction
+import copy
 import numpy as np
 from gillespy2.core.results import Trajectory,Results
-from collections import OrderedDict
 from gillespy2.core.gillespyError import *
 from .gillespyError import SimulationError
 from typing import Set, Type
+from functools import lru_cache
+from collections.abc import Mapping
+
+
+class _ParameterValues(Mapping):
+    # Read-only view of the current value of each parameter of a model, by name. Unlike Model.namespace,
+    # it reflects parameters whose values were edited directly.
+    def __init__(self, parameters):
+        self._parameters = parameters
+
+    def __getitem__(self, name):
+        return self._parameters[name].value
+
+    def __iter__(self):
+        return iter(self._parameters)
+
+    def __len__(self):
+        return len(self._parameters)
 
 try:
     import lxml.etree as eTree
@@ -36,10 +55,46 @@ try:
 
 except:
     import xml.etree.ElementTree as eTree
-    import xml.dom.minidom
-    import re
     no_pretty_print = True
 
+# Bound once, as StochMLDocument creates an element per model component.
+_Element = eTree.Element
+_SubElement = eTree.SubElement
+_tostring = eTree.tostring
+
+
+def _indent_elements(element, space='  ', level=0):
+    # Fallback for ElementTree.indent() (Python 3.9+): sets the whitespace text and tails of the tree in place.
+    if len(element):
+        child_indent = '\n' + space * (level + 1)
+        if not element.text or not element.text.strip():
+            element.text = child_indent
+        for child in element:
+            _indent_elements(child, space, level + 1)
+            if not child.tail or not child.tail.strip():
+                child.tail = child_indent
+        child.tail = '\n' + space * level
+
+
+_indent = getattr(eTree, 'indent', _indent_elements)
+
+
+# The (C++, Python) solver class names exported by gillespy2 for each algorithm, see Model.get_best_solver_algo().
+_ALGORITHM_SOLVERS = {
+    'Tau-Leaping': ('TauLeapingCSolver', 'TauLeapingSolver'),
+    'SSA': ('SSACSolver', 'NumPySSASolver'),
+    'ODE': ('ODECSolver', 'ODESolver'),
+    'Tau-Hybrid': ('TauHybridCSolver', 'TauHybridSolver'),
+}
+
+
+@lru_cache(maxsize=1)
+def _detect_cpp_available():
+    # The C++ toolchain is probed once per session, as get_best_solver() is called on every Model.run().
+    # Call _detect_cpp_available.cache_clear() to probe again after installing or removing g++/make.
+    from gillespy2.solvers.cpp.build.build_engine import BuildEngine
+    return not len(BuildEngine.get_missing_dependencies())
+
 
 def import_SBML(filename, name=None, gillespy_model=None):
     """
@@ -131,6 +186,32 @@ class Model(SortableObject, Jsonify):
     # reserved names for model species/parameter names, volume, and operators.
     reserved_names = ['vol']
     special_characters = ['[', ']', '+', '-', '*', '/', '.', '^']
+    # Set forms of the above, used for validating names.
+    _reserved_names_set = frozenset(reserved_names)
+    _special_characters_set = frozenset(special_characters)
+    # The component dictionaries whose keys share the model's namespace, see problem_with_name().
+    _named_components = (
+        ('listOfSpecies', 'A species'),
+        ('listOfParameters', 'A parameter'),
+        ('listOfReactions', 'A reaction'),
+        ('listOfEvents', 'An event'),
+        ('listOfRateRules', 'A rate rule'),
+        ('listOfAssignmentRules', 'An assignment rule'),
+        ('listOfFunctionDefinitions', 'A function definition'),
+    )
+
+    # The sections printed by __str__(), each with the header which precedes its components.
+    _str_sections = tuple(
+        (attribute, '\n**********\n' + header + '\n**********\n') for attribute, header in (
+            ('listOfSpecies', 'Species'),
+            ('listOfParameters', 'Parameters'),
+            ('listOfReactions', 'Reactions'),
+            ('listOfEvents', 'Events'),
+            ('listOfAssignmentRules', 'Assignment Rules'),
+            ('listOfRateRules', 'Rate Rules'),
+            ('listOfFunctionDefinitions', 'Function Definitions'),
+        )
+    )
 
     def __init__(self, name="", population=True, volume=1.0, tspan=None, annotation="model"):
         """ Create an empty model. """
@@ -141,27 +222,34 @@ class Model(SortableObject, Jsonify):
 
         # Dictionaries with model element objects.
         # Model element names are used as keys.
-        self.listOfParameters = OrderedDict()
-        self.listOfSpecies = OrderedDict()
-        self.listOfReactions = OrderedDict()
+        self.listOfParameters = {}
+        self.listOfSpecies = {}
+        self.listOfReactions = {}
 
-        self.listOfAssignmentRules = OrderedDict()
-        self.listOfRateRules = OrderedDict()
-        self.listOfEvents = OrderedDict()
-        self.listOfFunctionDefinitions = OrderedDict()
+        self.listOfAssignmentRules = {}
+        self.listOfRateRules = {}
+        self.listOfEvents = {}
+        self.listOfFunctionDefinitions = {}
 
         # Dictionaries with model element objects.
         # Model element names are used as keys, and values are
         # sanitized versions of the names/formulas.
         # These dictionaries contain sanitized values and are for
         # Internal use only
-        self._listOfParameters = OrderedDict()
-        self._listOfSpecies = OrderedDict()
-        self._listOfReactions = OrderedDict()
-        self._listOfAssignmentRules = OrderedDict()
-        self._listOfRateRules = OrderedDict()
-        self._listOfEvents = OrderedDict()
-        self._listOfFunctionDefinitions = OrderedDict()
+        self._listOfParameters = {}
+        self._listOfSpecies = {}
+        self._listOfReactions = {}
+        self._listOfAssignmentRules = {}
+        self._listOfRateRules = {}
+        self._listOfEvents = {}
+        self._listOfFunctionDefinitions = {}
+
+        # Counters used to generate the sanitized names above. They are never decremented,
+        # so a sanitized name is not reused after its element is deleted.
+        self._species_counter = 0
+        self._parameter_counter = 0
+        self._reaction_counter = 0
+
         # This defines the unit system at work for all numbers in the model
         # It should be a logical error to leave this undefined, subclasses
         # should set it
@@ -178,7 +266,7 @@ class Model(SortableObject, Jsonify):
 
         # Dict that holds flattended parameters and species for
         # evaluation of expressions in the scope of the model.
-        self.namespace = OrderedDict([])
+        self.namespace = {}
 
         if tspan is None:
             self.timespan(np.linspace(0, 20, 401))
@@ -192,79 +280,50 @@ class Model(SortableObject, Jsonify):
         self._generate_translation_table = True
 
     def __str__(self):
-        divider = '\n**********\n'
-
-        def decorate(header):
-            return '\n' + divider + header + divider
-
-        print_string = self.name
-        if len(self.listOfSpecies):
-            print_string += decorate('Species')
-            for s in sorted(self.listOfSpecies.values()):
-                print_string += '\n' + str(s)
-        if len(self.listOfParameters):
-            print_string += decorate('Parameters')
-            for p in sorted(self.listOfParameters.values()):
-                print_string += '\n' + str(p)
-        if len(self.listOfReactions):
-            print_string += decorate('Reactions')
-            for r in sorted(self.listOfReactions.values()):
-                print_string += '\n' + str(r)
-        if len(self.listOfEvents):
-            print_string += decorate('Events')
-            for e in sorted(self.listOfEvents.values()):
-                print_string += '\n' + str(e)
-        if len(self.listOfAssignmentRules):
-            print_string += decorate('Assignment Rules')
-            for ar in sorted(self.listOfAssignmentRules.values()):
-                print_string += '\n' + str(ar)
-        if len(self.listOfRateRules):
-            print_string += decorate('Rate Rules')
-            for rr in sorted(self.listOfRateRules.values()):
-                print_string += '\n' + str(rr)
-        if len(self.listOfFunctionDefinitions):
-            print_string += decorate('Function Definitions')
-            for fd in sorted(self.listOfFunctionDefinitions.values()):
-                print_string += '\n' + str(fd)
+        parts = [self.name]
+        for attribute, header in Model._str_sections:
+            components = getattr(self, attribute)
+            if len(components):
+                parts.append(header)
+                parts.extend(map(str, sorted(components.values())))
 
-        return print_string
+        return '\n'.join(parts)
 
     def make_translation_table(self):
-        from collections import ChainMap
-
-        species = self.listOfSpecies.values()
-        reactions = self.listOfReactions.values()
-        parameters = self.listOfParameters.values()
-        assignments = self.listOfAssignmentRules.values()
-        rates = self.listOfRateRules.values()
-        events = self.listOfEvents.values()
-        functions = self.listOfFunctionDefinitions.values()
-
         # A translation table is used to anonymize user-defined variable names and formulas into generic counterparts.
-        translation_table = dict(ChainMap(
-
-            # Build translation mappings for user-defined variable names.
-            dict({ self.name: "Model" }),
-            dict(zip((str(x.name) for x in species), (f"S_{x + 100}" for x in range(0, len(species))))),
-            dict(zip((str(x.name) for x in reactions), (f"R_{x + 100}" for x in range(0, len(reactions))))),
-            dict(zip((str(x.name) for x in parameters), (f"P_{x + 100}" for x in range(0, len(parameters))))),
-            dict(zip((str(x.name) for x in assignments), (f"AR_{x + 100}" for x in range(0, len(assignments))))),
-            dict(zip((str(x.name) for x in rates), (f"RR_{x + 100}" for x in range(0, len(rates))))),
-            dict(zip((str(x.name) for x in events), (f"E_{x + 100}" for x in range(0, len(events))))),
-            dict(zip((str(x.name) for x in functions), (f"F_{x + 100}" for x in range(0, len(functions))))),
-        ))
+        # Categories are added from lowest to highest precedence, so that later (higher precedence) updates win if a
+        # name is shared between categories, e.g. a species named after the model.
+        translation_table = {}
+        for prefix, components in (
+            ("F", self.listOfFunctionDefinitions),
+            ("E", self.listOfEvents),
+            ("RR", self.listOfRateRules),
+            ("AR", self.listOfAssignmentRules),
+            ("P", self.listOfParameters),
+            ("R", self.listOfReactions),
+            ("S", self.listOfSpecies),
+        ):
+            translation_table.update(
+                (str(component.name), f"{prefix}_{i + 100}") for i, component in enumerate(components.values())
+            )
+        translation_table[self.name] = "Model"
 
         return TranslationTable(to_anon=translation_table)
 
-    def serialize(self):
-        """ Serializes the Model object to valid StochML. """
+    def serialize(self, pretty=False):
+        """
+        Serializes the Model object to valid StochML.
+
+        :param pretty: If True, indent the document for human readability.
+        :type pretty: bool
+        """
         self.resolve_parameters()
         doc = StochMLDocument().from_model(self)
-        return doc.to_string()
+        return doc.to_string(pretty=pretty)
 
     def update_namespace(self):
         """ Create a dict with flattened parameter and species objects. """
-        self.namespace = OrderedDict([])
+        self.namespace = {}
         for param in self.listOfParameters:
             self.namespace[param] = self.listOfParameters[param].value
 
@@ -275,37 +334,22 @@ class Model(SortableObject, Jsonify):
 
         :returns: the dictionary mapping user species names to their internal GillesPy notation.
         """
-        species_name_mapping = OrderedDict([])
-        for i, name in enumerate(self.listOfSpecies.keys()):
-            species_name_mapping[name] = 'S[{}]'.format(i)
-        return species_name_mapping
+        return {name: f'S[{i}]' for i, name in enumerate(self.listOfSpecies)}
 
     def problem_with_name(self, name):
-        if name in Model.reserved_names:
+        if name in Model._reserved_names_set:
             raise ModelError(
                 'Name "{}" is unavailable. It is reserved for internal GillesPy use. Reserved Names: ({}).'.format(name,
                                                                                                                    Model.reserved_names))
-        if name in self.listOfSpecies:
-            raise ModelError('Name "{}" is unavailable. A species with that name exists.'.format(name))
-        if name in self.listOfParameters:
-            raise ModelError('Name "{}" is unavailable. A parameter with that name exists.'.format(name))
-        if name in self.listOfReactions:
-            raise ModelError('Name "{}" is unavailable. A reaction with that name exists.'.format(name))
-        if name in self.listOfEvents:
-            raise ModelError('Name "{}" is unavailable. An event with that name exists.'.format(name))
-        if name in self.listOfRateRules:
-            raise ModelError('Name "{}" is unavailable. A rate rule with that name exists.'.format(name))
-        if name in self.listOfAssignmentRules:
-            raise ModelError('Name "{}" is unavailable. An assignment rule with that name exists.'.format(name))
-        if name in self.listOfFunctionDefinitions:
-            raise ModelError('Name "{}" is unavailable. A function definition with that name exists.'.format(name))
+        for attribute, category in Model._named_components:
+            if name in getattr(self, attribute):
+                raise ModelError('Name "{}" is unavailable. {} with that name exists.'.format(name, category))
         if name.isdigit():
             raise ModelError('Name "{}" is unavailable. Names must not be numeric strings.'.format(name))
-        for special_character in Model.special_characters:
-            if special_character in name:
-                raise ModelError(
-                    'Name "{}" is unavailable. Names must not contain special characters: {}.'.format(name,
-                                                                                                      Model.special_characters))
+        if not Model._special_characters_set.isdisjoint(name):
+            raise ModelError(
+                'Name "{}" is unavailable. Names must not contain special characters: {}.'.format(name,
+                                                                                                  Model.special_characters))
 
     def get_species(self, s_name):
         """
@@ -332,13 +376,14 @@ class Model(SortableObject, Jsonify):
         """
 
         if isinstance(obj, list):
-            for S in sorted(obj):
+            for S in obj:
                 self.add_species(S)
         else:
             try:
                 self.problem_with_name(obj.name)
+                sanitized_name = f"S{self.__next_sanitized_index('_species_counter', self._listOfSpecies)}"
                 self.listOfSpecies[obj.name] = obj
-                self._listOfSpecies[obj.name] = 'S{}'.format(len(self._listOfSpecies))
+                self._listOfSpecies[obj.name] = sanitized_name
             except Exception as e:
                 raise ParameterError("Error using {} as a Species. Reason given: {}".format(obj, e))
         return obj
@@ -379,11 +424,10 @@ class Model(SortableObject, Jsonify):
 
         :returns: the dictionary mapping user parameter names to their internal GillesPy notation.
         """
-        parameter_name_mapping = OrderedDict()
-        parameter_name_mapping['vol'] = 'V'
-        for i, name in enumerate(self.listOfParameters.keys()):
-            if name not in parameter_name_mapping:
-                parameter_name_mapping[name] = 'P{}'.format(i)
+        parameter_name_mapping = {'vol': 'V'}
+        parameter_name_mapping.update(
+            {name: f'P{i}' for i, name in enumerate(self.listOfParameters) if name != 'vol'}
+        )
         return parameter_name_mapping
 
     def get_parameter(self, p_name):
@@ -413,15 +457,16 @@ class Model(SortableObject, Jsonify):
         :type params: Parameter, or list of parameters
         """
         if isinstance(params, list):
-            for p in sorted(params):
+            for p in params:
                 self.add_parameter(p)
         else:
             if isinstance(params, Parameter) or type(params).__name__ == 'Parameter':
                 self.problem_with_name(params.name)
-                self.update_namespace()
-                params._evaluate(self.namespace)
+                # The expression is evaluated against the parameters themselves, as they may have been edited directly.
+                params._evaluate(_ParameterValues(self.listOfParameters))
                 self.listOfParameters[params.name] = params
-                self._listOfParameters[params.name] = 'P{}'.format(len(self._listOfParameters))
+                self._listOfParameters[params.name] = \
+                    f"P{self.__next_sanitized_index('_parameter_counter', self._listOfParameters)}"
             else:
                 raise ParameterError("Parameter {}  must be of type {}, it is of type {}".format(params, str(type(Parameter)), str(params) ))
         return params
@@ -467,21 +512,23 @@ class Model(SortableObject, Jsonify):
         self._listOfParameters.clear()
 
     def validate_reactants_and_products(self, reactions):
-        for reactant in list(reactions.reactants.keys()):
-            if isinstance(reactant, str):
-                if reactant not in self.listOfSpecies.keys():
-                    raise ModelError(
-                        'reactant: {0} for reaction {1} -- not found in model.listOfSpecies'.format(reactant,
-                                                                                                    reactions.name))
-                reactions.reactants[self.listOfSpecies[reactant]] = reactions.reactants[reactant]
-                del reactions.reactants[reactant]
-        for product in list(reactions.products.keys()):
-            if isinstance(product, str):
-                if product not in self.listOfSpecies.keys():
-                    raise ModelError('product: {0} for reaction {1} -- not found in model.listOfSpecies'.format(product,
-                                                                                                                reactions.name))
-                reactions.products[self.listOfSpecies[product]] = reactions.products[product]
-                del reactions.products[product]
+        reactions.reactants = self.__resolve_species_names(reactions.reactants, 'reactant', reactions.name)
+        reactions.products = self.__resolve_species_names(reactions.products, 'product', reactions.name)
+
+    def __resolve_species_names(self, stoichiometry, role, reaction_name):
+        # Entries already keyed by Species objects need no work, so the common case is a single scan.
+        if not any(isinstance(species, str) for species in stoichiometry):
+            return stoichiometry
+
+        resolved = {}
+        for species, value in stoichiometry.items():
+            if isinstance(species, str):
+                if species not in self.listOfSpecies:
+                    raise ModelError('{0}: {1} for reaction {2} -- not found in model.listOfSpecies'.format(
+                        role, species, reaction_name))
+                species = self.listOfSpecies[species]
+            resolved[species] = value
+        return resolved
 
     def add_reaction(self, reactions):
         """
@@ -494,7 +541,7 @@ class Model(SortableObject, Jsonify):
 
         # TODO, make sure that you cannot overwrite an existing reaction
         if isinstance(reactions, list):
-            for r in sorted(reactions):
+            for r in reactions:
                 self.add_reaction(r)
         else:
             try:
@@ -514,7 +561,9 @@ class Model(SortableObject, Jsonify):
                         raise ModelError("Duplicate name of reaction: {0}".format(reactions.name))
                     self.listOfReactions[reactions.name] = reactions
                 # Build Sanitized reaction as well
-                sanitized_reaction = Reaction(name='R{}'.format(len(self._listOfReactions)))
+                sanitized_reaction = Reaction(
+                    name=f"R{self.__next_sanitized_index('_reaction_counter', self._listOfReactions)}"
+                )
                 sanitized_reaction.reactants = {self._listOfSpecies[species.name]: reactions.reactants[species] for
                                                 species in reactions.reactants}
                 sanitized_reaction.products = {self._listOfSpecies[species.name]: reactions.products[species] for
@@ -534,25 +583,11 @@ class Model(SortableObject, Jsonify):
         :type rate_rules: RateRule, or list of RateRules
         """
         if isinstance(rate_rules, list):
-            for rr in sorted(rate_rules):
+            for rr in rate_rules:
                 self.add_rate_rule(rr)
         else:
             try:
-                self.problem_with_name(rate_rules.name)
-                if len(self.listOfAssignmentRules) != 0:
-                    for i in self.listOfAssignmentRules.values():
-                        if rate_rules.variable == i.variable:
-                            raise ModelError("Duplicate variable in rate_rules AND assignment_rules: {0}".
-                                             format(rate_rules.variable))
-                for i in self.listOfRateRules.values():
-                    if rate_rules.variable == i.variable:
-                        raise ModelError("Duplicate variable in rate_rules: {0}".format(rate_rules.variable))
-                if rate_rules.name in self.listOfRateRules:
-                    raise ModelError("Duplicate name of rate_rule: {0}".format(rate_rules.name))
-                if rate_rules.formula == '':
-                    raise ModelError('Invalid Rate Rule. Expression must be a non-empty string value')
-                if rate_rules.variable == None:
-                    raise ModelError('A GillesPy2 Rate Rule must be associated with a valid variable')
+                self.__validate_rule(rate_rules, self.listOfRateRules)
                 if isinstance(rate_rules.variable, str):
                     v = rate_rules.variable
                     if v not in self.listOfSpecies and v not in self.listOfParameters:
@@ -624,23 +659,7 @@ class Model(SortableObject, Jsonify):
                 self.add_assignment_rule(ar)
         else:
             try:
-                self.problem_with_name(assignment_rules.name)
-                if len(self.listOfRateRules) != 0:
-                    for i in self.listOfRateRules.values():
-                        if assignment_rules.variable == i.variable:
-                            raise ModelError("Duplicate variable in rate_rules AND assignment_rules: {0}".
-                                             format(assignment_rules.variable))
-                for i in self.listOfAssignmentRules.values():
-                    if assignment_rules.variable == i.variable:
-                        raise ModelError("Duplicate variable in assignment_rules: {0}"
-                                         .format(assignment_rules.variable))
-                if assignment_rules.name in self.listOfAssignmentRules:
-                    raise ModelError("Duplicate name in assignment_rules: {0}".format(assignment_rules.name))
-                if assignment_rules.formula == '':
-                    raise ModelError('Invalid Assignment Rule. Expression must be a non-empty string value')
-                if assignment_rules.variable == None:
-                    raise ModelError('A GillesPy2 Rate Rule must be associated with a valid variable')
-
+                self.__validate_rule(assignment_rules, self.listOfAssignmentRules)
                 self.listOfAssignmentRules[assignment_rules.name] = assignment_rules
             except Exception as e:
                 raise ParameterError("Error using {} as a Assignment Rule. Reason given: {}".format(assignment_rules, e))
@@ -712,7 +731,7 @@ class Model(SortableObject, Jsonify):
         :param ename: Name of Event to be removed
         """
         self.listOfEvents.pop(ename)
-        self._listOfEvents.pop(ename)
+        self._listOfEvents.pop(ename, None)
 
     def delete_all_events(self):
         """
@@ -740,7 +759,7 @@ class Model(SortableObject, Jsonify):
         :param rname: Name of Rate Rule to be removed
         """
         self.listOfRateRules.pop(rname)
-        self._listOfRateRules.pop(rname)
+        self._listOfRateRules.pop(rname, None)
 
     def delete_all_rate_rules(self):
         """
@@ -769,7 +788,7 @@ class Model(SortableObject, Jsonify):
         :param aname: Name of AssignmentRule object to be removed from model
         """
         self.listOfAssignmentRules.pop(aname)
-        self._listOfAssignmentRules.pop(aname)
+        self._listOfAssignmentRules.pop(aname, None)
 
     def delete_all_assignment_rules(self):
         """
@@ -798,7 +817,7 @@ class Model(SortableObject, Jsonify):
         :param fname: Name of Function Definition to be removed
         """
         self.listOfFunctionDefinitions.pop(fname)
-        self._listOfFunctionDefinitions.pop(fname)
+        self._listOfFunctionDefinitions.pop(fname, None)
 
     def delete_all_function_definitions(self):
         """
@@ -814,20 +833,12 @@ class Model(SortableObject, Jsonify):
         :param ename: name of element to search for
         :returns: value of element, or 'element not found'
         """
-        if ename in self.listOfReactions:
-            return self.get_reaction(ename)
-        if ename in self.listOfSpecies:
-            return self.get_species(ename)
-        if ename in self.listOfParameters:
-            return self.get_parameter(ename)
-        if ename in self.listOfEvents:
-            return self.get_event(ename)
-        if ename in self.listOfRateRules:
-            return self.get_rate_rule(ename)
-        if ename in self.listOfAssignmentRules:
-            return self.get_assignment_rule(ename)
-        if ename in self.listOfFunctionDefinitions:
-            return self.get_function_definition(ename)
+        # A single probe per component dictionary, rather than a membership test followed by a lookup.
+        for components in (self.listOfReactions, self.listOfSpecies, self.listOfParameters, self.listOfEvents,
+                           self.listOfRateRules, self.listOfAssignmentRules, self.listOfFunctionDefinitions):
+            element = components.get(ename)
+            if element is not None:
+                return element
         raise ModelError(f"model.get_element(): element={ename} not found")
 
 
@@ -851,15 +862,10 @@ class Model(SortableObject, Jsonify):
             hybrid_check = True
             chybrid_check = False
 
-        if len(self.get_all_species()) and hybrid_check == False:
-            for i in self.get_all_species():
-                tempMode = self.get_species(i).mode
-                if tempMode == 'dynamic' or tempMode == 'continuous':
-                    hybrid_check = True
-                    break
+        if not hybrid_check:
+            hybrid_check = any(species.mode in ('dynamic', 'continuous') for species in self.listOfSpecies.values())
 
-        from gillespy2.solvers.cpp.build.build_engine import BuildEngine
-        can_use_cpp = not len(BuildEngine.get_missing_dependencies())
+        can_use_cpp = _detect_cpp_available()
 
         if not can_use_cpp and not can_use_numpy:
             raise ModelError('Dependency Error, cannot run model.')
@@ -884,8 +890,7 @@ class Model(SortableObject, Jsonify):
         If user has specified a particular algorithm, we return either the Python or C++ version of that algorithm
         """
         from gillespy2.solvers.numpy import can_use_numpy
-        from gillespy2.solvers.cpp.build.build_engine import BuildEngine
-        can_use_cpp = not len(BuildEngine.get_missing_dependencies())
+        can_use_cpp = _detect_cpp_available()
         chybrid_check = True
         if len(self.get_all_assignment_rules()) or len(self.get_all_function_definitions()):
             chybrid_check = False
@@ -893,42 +898,14 @@ class Model(SortableObject, Jsonify):
         if not can_use_cpp and can_use_numpy:
             raise ModelError("Please install C++ or Numpy to use GillesPy2 solvers.")
 
-        if algorithm == 'Tau-Leaping':
-            if can_use_cpp:
-                from gillespy2 import TauLeapingCSolver
-                return TauLeapingCSolver
-            else:
-                from gillespy2 import TauLeapingSolver
-                return TauLeapingSolver
-
-        elif algorithm == 'SSA':
-            if can_use_cpp:
-                from gillespy2 import SSACSolver
-                return SSACSolver
-            else:
-                from gillespy2 import NumPySSASolver
-                return NumPySSASolver
-
-        elif algorithm == 'ODE':
-            if can_use_cpp:
-                from gillespy2 import ODECSolver
-                return ODECSolver
-            else:
-                from gillespy2 import ODESolver
-                return ODESolver
-
-        elif algorithm == 'Tau-Hybrid':
-            if can_use_cpp and chybrid_check:
-                from gillespy2 import TauHybridCSolver
-                return TauHybridCSolver
-            else:
-                from gillespy2 import TauHybridSolver
-                return TauHybridSolver
-
-        else:
+        solver_names = _ALGORITHM_SOLVERS.get(algorithm)
+        if solver_names is None:
             raise ModelError("Invalid value for the argument 'algorithm' entered. "
                              "Please enter 'SSA', 'ODE', 'Tau-leaping', or 'Tau-Hybrid'.")
 
+        use_cpp = can_use_cpp and (chybrid_check or algorithm != 'Tau-Hybrid')
+        return getattr(gillespy2, solver_names[0] if use_cpp else solver_names[1])
+
     def get_model_features(self) -> "Set[Type]":
         """
         Determine what solver-specific model features are present on the model.
@@ -947,6 +924,123 @@ class Model(SortableObject, Jsonify):
             features.add(gillespy2.FunctionDefinition)
         return features
 
+    def __next_sanitized_index(self, counter_name, sanitized_names):
+        """
+        Get and advance one of the counters which generate sanitized names. Models decoded from JSON written
+        before the counters existed derive them from the sanitized names they already have.
+        """
+        index = self.__dict__.get(counter_name)
+        if index is None:
+            names = (getattr(name, 'name', name) for name in sanitized_names.values())
+            index = max((int(name[1:]) for name in names), default=-1) + 1
+        self.__dict__[counter_name] = index + 1
+        return index
+
+    def __validate_rule(self, rule, rules):
+        # The checks shared by add_rate_rule() and add_assignment_rule().
+        if isinstance(rule, RateRule):
+            rule_type, label, plural = RateRule, 'Rate Rule', 'rate_rules'
+        else:
+            rule_type, label, plural = AssignmentRule, 'Assignment Rule', 'assignment_rules'
+
+        self.problem_with_name(rule.name)
+        variable = getattr(rule.variable, 'name', rule.variable)
+        for existing_type, existing_rules in ((RateRule, self.listOfRateRules),
+                                              (AssignmentRule, self.listOfAssignmentRules)):
+            for existing_rule in existing_rules.values():
+                if getattr(existing_rule.variable, 'name', existing_rule.variable) != variable:
+                    continue
+                if existing_type is rule_type:
+                    raise ModelError("Duplicate variable in {0}: {1}".format(plural, rule.variable))
+                raise ModelError("Duplicate variable in rate_rules AND assignment_rules: {0}".format(rule.variable))
+        if rule.name in rules:
+            raise ModelError("Duplicate name in {0}: {1}".format(plural, rule.name))
+        if rule.formula == '':
+            raise ModelError('Invalid {0}. Expression must be a non-empty string value'.format(label))
+        if rule.variable == None:
+            raise ModelError('A GillesPy2 {0} must be associated with a valid variable'.format(label))
+
+    @property
+    def stoich_matrix(self) -> np.ndarray:
+        """
+        The (reactions x species) int32 net stoichiometry matrix. It is built from the current species
+        and reactions on each access.
+        """
+        return self.__stoich_structure()[1]
+
+    @property
+    def reactant_power_matrix(self) -> np.ndarray:
+        """
+        The (reactions x species) int32 matrix of reactant stoichiometries, i.e. the powers to which
+        each species is raised in a reaction's mass-action propensity. Built on each access, like stoich_matrix.
+        """
+        return self.__stoich_structure()[2]
+
+    def __stoich_structure(self):
+        # Rebuilt on every call, as reactions' reactants and products may be edited in place.
+        species_index = {name: i for i, name in enumerate(self.listOfSpecies)}
+        reactions = self.listOfReactions.values()
+
+        nu = np.zeros((len(reactions), len(species_index)), dtype=np.int32)
+        powers = np.zeros((len(reactions), len(species_index)), dtype=np.int32)
+        for j, reaction in enumerate(reactions):
+            for species, stoichiometry in reaction.reactants.items():
+                i = species_index[getattr(species, 'name', species)]
+                nu[j, i] -= stoichiometry
+                powers[j, i] += stoichiometry
+            for species, stoichiometry in reaction.products.items():
+                nu[j, species_index[getattr(species, 'name', species)]] += stoichiometry
+
+        return species_index, nu, powers
+
+    def to_soa(self) -> dict:
+        """
+        Export the model's reaction network as a structure of contiguous numpy arrays, for use by
+        vectorized solver kernels. Species and reactions are indexed in the order they were added.
+
+        :returns: A dict containing:
+            'species_index': dict mapping species names to their column index;
+            'nu': (reactions x species) int32 net stoichiometry matrix, see stoich_matrix;
+            'k': float64 mass-action rate constants, NaN for reactions with a custom propensity function
+            (or a rate which can not be evaluated from the model's parameters);
+            'reactant_csr_ptr', 'reactant_csr_idx', 'reactant_csr_val': the reactant species indices and
+            stoichiometries of reaction j, stored at [reactant_csr_ptr[j], reactant_csr_ptr[j + 1]);
+            'x0': float64 initial values of the species.
+        """
+        species_index, nu, powers = self.__stoich_structure()
+
+        # Compress the reactant powers into CSR form, row by row.
+        rows, cols = np.nonzero(powers)
+        csr_ptr = np.zeros(len(powers) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(powers)), out=csr_ptr[1:])
+
+        k = np.full(len(self.listOfReactions), np.nan)
+        for j, reaction in enumerate(self.listOfReactions.values()):
+            if reaction.massaction and reaction.marate is not None:
+                k[j] = self.__rate_value(reaction.marate)
+
+        return {
+            'species_index': dict(species_index),
+            'nu': nu,
+            'k': k,
+            'reactant_csr_ptr': csr_ptr,
+            'reactant_csr_idx': cols.astype(np.int64),
+            'reactant_csr_val': powers[rows, cols].astype(np.int64),
+            'x0': np.array([species.initial_value for species in self.listOfSpecies.values()], dtype=np.float64),
+        }
+
+    def __rate_value(self, rate):
+        # Mass-action rates are given as a Parameter, the name of a parameter, or an expression of parameters.
+        if isinstance(rate, Parameter):
+            return rate.value
+        if rate in self.listOfParameters:
+            return self.listOfParameters[rate].value
+        try:
+            return float(eval(_compile_expression(str(rate)), {}, _ParameterValues(self.listOfParameters)))
+        except Exception:
+            # Rates which can not be evaluated from the parameters alone are treated like custom propensities.
+            return np.nan
+
     def run(self, solver=None, timeout=0, t=None, increment=None, show_labels=True, cpp_support=False, algorithm=None,
             **solver_args):
         """
@@ -1029,7 +1123,7 @@ class StochMLDocument():
 
     def __init__(self):
         # The root element
-        self.document = eTree.Element("Model")
+        self.document = _Element("Model")
         self.annotation = None
 
     @classmethod
@@ -1061,7 +1155,7 @@ class StochMLDocument():
         # Description
         md = cls()
 
-        d = eTree.Element('Description')
+        d = _Element('Description')
 
         #
         if model.units.lower() == "concentration":
@@ -1071,23 +1165,23 @@ class StochMLDocument():
         md.document.append(d)
 
         # Number of Reactions
-        nr = eTree.Element('NumberOfReactions')
+        nr = _Element('NumberOfReactions')
         nr.text = str(len(model.listOfReactions))
         md.document.append(nr)
 
         # Number of Species
-        ns = eTree.Element('NumberOfSpecies')
+        ns = _Element('NumberOfSpecies')
         ns.text = str(len(model.listOfSpecies))
         md.document.append(ns)
 
         # Species
-        spec = eTree.Element('SpeciesList')
+        spec = _Element('SpeciesList')
         for sname in model.listOfSpecies:
             spec.append(md.__species_to_element(model.listOfSpecies[sname]))
         md.document.append(spec)
 
         # Parameters
-        params = eTree.Element('ParametersList')
+        params = _Element('ParametersList')
         for pname in model.listOfParameters:
             params.append(md.__parameter_to_element(
                 model.listOfParameters[pname]))
@@ -1097,7 +1191,7 @@ class StochMLDocument():
         md.document.append(params)
 
         # Reactions
-        reacs = eTree.Element('ReactionsList')
+        reacs = _Element('ReactionsList')
         for rname in model.listOfReactions:
             reacs.append(md.__reaction_to_element(model.listOfReactions[rname], model.volume))
         md.document.append(reacs)
@@ -1169,44 +1263,34 @@ class StochMLDocument():
             else:  # Default
                 model.units = "population"
 
+        # Collect the component elements in a single traversal of the document.
+        elements = {'Parameter': [], 'Species': [], 'Reaction': []}
+        for element in root.iter():
+            if element.tag in elements:
+                elements[element.tag].append(element)
+
         # Create parameters
-        for px in root.iter('Parameter'):
+        for px in elements['Parameter']:
             name = px.find('Id').text
             expr = px.find('Expression').text
             if name.lower() == 'vol' or name.lower() == 'volume':
                 model.volume = float(expr)
             else:
-                p = Parameter(name, expression=expr)
-                # Try to evaluate the expression in the empty namespace
-                # (if the expr is a scalar value)
-                p._evaluate()
-                model.add_parameter(p)
+                # add_parameter() evaluates the expression in the model's namespace.
+                model.add_parameter(Parameter(name, expression=expr))
 
         # Create species
-        for spec in root.iter('Species'):
+        for spec in elements['Species']:
             name = spec.find('Id').text
             val = spec.find('InitialPopulation').text
             if '.' in val:
                 val = float(val)
             else:
                 val = int(val)
-            s = Species(name, initial_value=val)
-            model.add_species([s])
-
-        # The namespace_propensity for evaluating the propensity function
-        # for reactions must contain all the species and parameters.
-        namespace_propensity = OrderedDict()
-        all_species = model.get_all_species()
-        all_parameters = model.get_all_parameters()
-
-        for param in all_species:
-            namespace_propensity[param] = all_species[param].initial_value
-
-        for param in all_parameters:
-            namespace_propensity[param] = all_parameters[param].value
+            model.add_species(Species(name, initial_value=val))
 
         # Create reactions
-        for reac in root.iter('Reaction'):
+        for reac in elements['Reaction']:
             try:
                 name = reac.find('Id').text
             except:
@@ -1274,11 +1358,8 @@ class StochMLDocument():
                         # value should now be found in 'ratename'.
                         generated_rate_name = "Reaction_" + name + \
                                               "_rate_constant"
-                        p = Parameter(name=generated_rate_name,
-                                      expression=ratename)
-                        # Try to evaluate the parameter to set its value
-                        p._evaluate()
-                        model.add_parameter(p)
+                        model.add_parameter(Parameter(name=generated_rate_name,
+                                                      expression=ratename))
                         reaction.marate = model.listOfParameters[
                             generated_rate_name]
 
@@ -1301,93 +1382,62 @@ class StochMLDocument():
 
         return model
 
-    def to_string(self):
-        """ Returns  the document as a string. """
-        try:
-            doc = eTree.tostring(self.document, pretty_print=True)
+    def to_string(self, pretty=True):
+        """
+        Returns  the document as a string.
+
+        :param pretty: If False, write the tree in a single pass without reformatting it.
+        :type pretty: bool
+        """
+        if not pretty:
+            return _tostring(self.document, encoding="unicode")
+        if not no_pretty_print:
+            doc = _tostring(self.document, pretty_print=True)
             return doc.decode("utf-8")
-        except:
-            # Hack to print pretty xml without pretty-print
-            # (requires the lxml module).
-            doc = eTree.tostring(self.document)
-            xmldoc = xml.dom.minidom.parseString(doc)
-            uglyXml = xmldoc.toprettyxml(indent='  ')
-            text_re = re.compile(">\n\s+([^<>\s].*?)\n\s+</", re.DOTALL)
-            prettyXml = text_re.sub(">\g<1></", uglyXml)
-            return prettyXml
+
+        # The standard library cannot pretty-print while writing, so whitespace is added to a copy of the tree.
+        document = copy.deepcopy(self.document)
+        _indent(document)
+        return '<?xml version="1.0" ?>\n' + _tostring(document, encoding="unicode") + '\n'
 
     def __species_to_element(self, S):
-        e = eTree.Element('Species')
-        idElement = eTree.Element('Id')
-        idElement.text = S.name
-        e.append(idElement)
+        e = _Element('Species')
+        _SubElement(e, 'Id').text = S.name
 
         if hasattr(S, 'description'):
-            descriptionElement = eTree.Element('Description')
-            descriptionElement.text = S.description
-            e.append(descriptionElement)
+            _SubElement(e, 'Description').text = S.description
 
-        initialPopulationElement = eTree.Element('InitialPopulation')
-        initialPopulationElement.text = str(S.initial_value)
-        e.append(initialPopulationElement)
+        _SubElement(e, 'InitialPopulation').text = str(S.initial_value)
 
         return e
 
     def __parameter_to_element(self, P):
-        e = eTree.Element('Parameter')
-        idElement = eTree.Element('Id')
-        idElement.text = P.name
-        e.append(idElement)
-        expressionElement = eTree.Element('Expression')
-        expressionElement.text = str(P.value)
-        e.append(expressionElement)
+        e = _Element('Parameter')
+        _SubElement(e, 'Id').text = P.name
+        _SubElement(e, 'Expression').text = str(P.value)
         return e
 
     def __reaction_to_element(self, R, model_volume):
-        e = eTree.Element('Reaction')
-
-        idElement = eTree.Element('Id')
-        idElement.text = R.name
-        e.append(idElement)
-
-        descriptionElement = eTree.Element('Description')
-        descriptionElement.text = self.annotation
-        e.append(descriptionElement)
+        e = _Element('Reaction')
+        _SubElement(e, 'Id').text = R.name
+        _SubElement(e, 'Description').text = self.annotation
 
         # StochKit2 wants a rate for mass-action propensites
         if R.massaction and model_volume == 1.0:
-            rateElement = eTree.Element('Rate')
+            _SubElement(e, 'Type').text = 'mass-action'
             # A mass-action reactions should only have one parameter
-            rateElement.text = R.marate.name
-            typeElement = eTree.Element('Type')
-            typeElement.text = 'mass-action'
-            e.append(typeElement)
-            e.append(rateElement)
+            _SubElement(e, 'Rate').text = R.marate.name
 
         else:
-            typeElement = eTree.Element('Type')
-            typeElement.text = 'customized'
-            e.append(typeElement)
-            functionElement = eTree.Element('PropensityFunction')
-            functionElement.text = R.propensity_function
-            e.append(functionElement)
-
-        reactants = eTree.Element('Reactants')
+            _SubElement(e, 'Type').text = 'customized'
+            _SubElement(e, 'PropensityFunction').text = R.propensity_function
 
+        reactants = _SubElement(e, 'Reactants')
         for reactant, stoichiometry in R.reactants.items():
-            srElement = eTree.Element('SpeciesReference')
-            srElement.set('id', str(reactant.name))
-            srElement.set('stoichiometry', str(stoichiometry))
-            reactants.append(srElement)
-
-        e.append(reactants)
+            _SubElement(reactants, 'SpeciesReference', {'id': str(reactant.name), 'stoichiometry': str(stoichiometry)})
 
-        products = eTree.Element('Products')
+        products = _SubElement(e, 'Products')
         for product, stoichiometry in R.products.items():
-            srElement = eTree.Element('SpeciesReference')
-            srElement.set('id', str(product.name))
-            srElement.set('stoichiometry', str(stoichiometry))
-            products.append(srElement)
-        e.append(products)
+            _SubElement(products, 'SpeciesReference', {'id': str(product.name), 'stoichiometry': str(stoichiometry)})
 
         return e
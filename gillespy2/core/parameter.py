@@ -16,10 +16,18 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from functools import lru_cache
+
 from gillespy2.core.sortableobject import SortableObject
 from gillespy2.core.gillespyError import *
 from gillespy2.core.jsonify import Jsonify
 
+@lru_cache(maxsize=4096)
+def _compile_expression(expression):
+    # Models re-resolve their parameters on every export, so each distinct expression is only parsed once.
+    # eval() ignores leading spaces and tabs in source strings, compile() does not.
+    return compile(expression.lstrip(' \t'), '<string>', 'eval')
+
 class Parameter(SortableObject, Jsonify):
     """
     A parameter can be given as an expression (function) or directly
@@ -81,7 +89,9 @@ class Parameter(SortableObject, Jsonify):
         """
 
         try:
-            self.value = (float(eval(self.expression, namespace)))
+            # The namespace is passed as locals so that eval() does not inject
+            # '__builtins__' into the caller's (possibly model-owned) dict.
+            self.value = (float(eval(_compile_expression(self.expression), {}, namespace)))
         except Exception as error:
             raise ParameterError("Could not evaluate expression: {}.".format(str(error))) from error
 
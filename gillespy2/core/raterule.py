@@ -50,8 +50,9 @@ class RateRule(SortableObject, Jsonify):
             return 'Rate Rule: {} contains an invalid variable or formula'.format(self.name)
 
     def sanitized_formula(self, species_mappings, parameter_mappings):
-        names = sorted(list(species_mappings.keys()) + list(parameter_mappings.keys()), key=lambda x: len(x),
-                       reverse=True)
+        # Names which do not occur in the formula would be no-op replacements, so they are dropped before sorting.
+        names = sorted([name for name in (*species_mappings, *parameter_mappings) if name in self.formula],
+                       key=len, reverse=True)
         replacements = [parameter_mappings[name] if name in parameter_mappings else species_mappings[name]
                         for name in names]
         sanitized_formula = self.formula
@@ -17,7 +17,10 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import os
+import ast
 import gillespy2
+from collections import deque
+from functools import lru_cache
 import numpy as np
 import math
 import re
@@ -30,8 +33,6 @@ except ImportError:
 from gillespy2.core import gillespyError
 
 
-init_state = {'INF': np.inf, 'NaN': np.nan}
-postponed_evals = {}
 eval_globals = math.__dict__.copy()
 def piecewise(*args):
     args = list(args)
@@ -45,6 +46,11 @@ def piecewise(*args):
     return sol
 eval_globals['piecewise'] = piecewise
 
+@lru_cache(maxsize=4096)
+def __compile(expression):
+    # Postponed expressions are re-evaluated on every pass of __resolve_evals, so each is only parsed once.
+    return compile(expression, '<sbml>', 'eval')
+
 def __read_sbml_model(filename):
 
     document = libsbml.readSBML(filename)
@@ -53,34 +59,34 @@ def __read_sbml_model(filename):
     if error_count > 0:
         for i in range(error_count):
             error = document.getError(i)
-            converter_code = 0
             converter_code = -10
 
             errors.append(["SBML {0}, code {1}, line {2}: {3}".format(error.getSeverityAsString(), error.getErrorId(),
                                                                       error.getLine(), error.getMessage()),
                            converter_code])
-    if min([code for error, code in errors] + [0]) < 0:
+    if any(code < 0 for error, code in errors):
         return None, errors
     sbml_model = document.getModel()
 
     return sbml_model, errors
 
+# Translates SBML L3 formula syntax into Python, in a single pass over the formula.
+math_replacements = {
+    'ln': 'log',
+    '^': '**',
+    '&&': 'and',
+    '||': 'or'
+    }
+math_re = re.compile(r'\bln\b|\^|&&|\|\|')
+
 def __get_math(math):
     math_str = libsbml.formulaToL3String(math)
-    replacements = {
-        r'\bln\b': 'log',
-        r'\^': '**',
-        r'\&\&': 'and',
-        r'\|\|': 'or'
-        }
-    for old, new in replacements.items():
-        math_str = re.sub(old, new, math_str)
-    return math_str
-
-def __get_species(sbml_model, gillespy_model, errors):
-
-    for i in range(sbml_model.getNumSpecies()):
-        species = sbml_model.getSpecies(i)
+    return math_re.sub(lambda match: math_replacements[match.group()], math_str)
+
+def __get_species(sbml_model, gillespy_model, errors, init_state, postponed_evals):
+
+    gillespy_species_list = []
+    for species in sbml_model.getListOfSpecies():
         name = species.getId()
         population = None
         concentration = None
@@ -96,9 +102,6 @@ def __get_species(sbml_model, gillespy_model, errors):
         elif species.getHasOnlySubstanceUnits(): # Treat as population
             if population is not None: # If population is provided
                 value = population
-                int_value = int(species.getInitialAmount())
-                if population == int_value:
-                    population = int_value
             else: # Else convert concentration to population
                 postponed_evals[name] = '{} * {}'.format(name, cid)
                 value = concentration
@@ -117,13 +120,15 @@ def __get_species(sbml_model, gillespy_model, errors):
         gillespy_species = gillespy2.Species(name=name, initial_value=value,
                                                 allow_negative_populations=is_negative, mode=mode,
                                                 constant=constant, boundary_condition=boundary_condition)
-        gillespy_model.add_species([gillespy_species])
+        gillespy_species_list.append(gillespy_species)
         init_state[name] = value
-    
-def __get_parameters(sbml_model, gillespy_model):
+    gillespy_model.add_species(gillespy_species_list)
+
+def __get_parameters(sbml_model, gillespy_model, init_state):
 
-    for i in range(sbml_model.getNumParameters()):
-        parameter = sbml_model.getParameter(i)
+    gillespy_parameters = []
+    gillespy_species_list = []
+    for parameter in sbml_model.getListOfParameters():
         name = parameter.getId()
         if parameter.isSetValue():
             value = parameter.getValue()
@@ -134,14 +139,16 @@ def __get_parameters(sbml_model, gillespy_model):
         # GillesPy2 represents non-constant parameters as species
         if parameter.isSetConstant():
             gillespy_parameter = gillespy2.Parameter(name=name, expression=value)
-            gillespy_model.add_parameter([gillespy_parameter])
+            gillespy_parameters.append(gillespy_parameter)
         else:
             gillespy_species = gillespy2.Species(name=name,initial_value=value)
-            gillespy_model.add_species([gillespy_species])
+            gillespy_species_list.append(gillespy_species)
+    gillespy_model.add_parameter(gillespy_parameters)
+    gillespy_model.add_species(gillespy_species_list)
 
-def __get_compartments(sbml_model, gillespy_model):
-    for i in range(sbml_model.getNumCompartments()):
-        compartment = sbml_model.getCompartment(i)
+def __get_compartments(sbml_model, gillespy_model, init_state):
+    gillespy_parameters = []
+    for compartment in sbml_model.getListOfCompartments():
         name = compartment.getId()
         value = compartment.getSize()
 
@@ -150,7 +157,8 @@ def __get_compartments(sbml_model, gillespy_model):
         else:
             gillespy_parameter = gillespy2.Parameter(name=name, expression=value)
             init_state[name] = value
-            gillespy_model.add_parameter([gillespy_parameter])
+            gillespy_parameters.append(gillespy_parameter)
+    gillespy_model.add_parameter(gillespy_parameters)
 
     '''
     for i in range(sbml_model.getNumCompartments()):
@@ -165,13 +173,19 @@ def __get_compartments(sbml_model, gillespy_model):
                               compartment.getSpatialDimensions()), -5])
     '''
 def traverse_math(node, old_id, new_id):
+    __rename_math(node, {old_id: new_id})
+
+def __rename_math(node, renames):
+    # Replace every name node found in renames, in a single walk of the tree.
     if node is None: return
     for i in range(node.getNumChildren()):
-        if node.getChild(i).getName() == old_id:
-            new_node = libsbml.ASTNode()
-            new_node.setName(new_id)
-            node.replaceChild(i, new_node)
-        traverse_math(node.getChild(i), old_id, new_id)
+        child = node.getChild(i)
+        new_id = renames.get(child.getName())
+        if new_id is not None:
+            child = libsbml.ASTNode()
+            child.setName(new_id)
+            node.replaceChild(i, child)
+        __rename_math(child, renames)
 
 def __get_kinetic_law(sbml_model, gillespy_model, reaction):
     kinetic_law = reaction.getKineticLaw()
@@ -184,14 +198,17 @@ def __get_kinetic_law(sbml_model, gillespy_model, reaction):
     tree = kinetic_law.getMath()
     params = kinetic_law.getListOfParameters()
     local_params = kinetic_law.getListOfLocalParameters()
+    renames = {}
     for i in range(kinetic_law.getNumLocalParameters()):
         lp = local_params.get(i)
         old_id = lp.getId()
         new_id = ('{}_{}'.format(reaction.getId(), lp.getId()))
-        traverse_math(tree, old_id, new_id)
+        renames[old_id] = new_id
         lp.setId(new_id)
         gillespy_parameter = gillespy2.Parameter(name=new_id, expression=lp.getValue())
         gillespy_model.add_parameter([gillespy_parameter])
+    if renames:
+        __rename_math(tree, renames)
     for i in range(kinetic_law.getNumParameters()):
         p = params.get(i)
         if not p.getId() in gillespy_model.listOfParameters:
@@ -201,47 +218,30 @@ def __get_kinetic_law(sbml_model, gillespy_model, reaction):
         
 def __get_reactions(sbml_model, gillespy_model, errors):
     # reactions
-    for i in range(sbml_model.getNumReactions()):
-        reaction = sbml_model.getReaction(i)
+    gillespy_reactions = []
+    for reaction in sbml_model.getListOfReactions():
         name = reaction.getId()
         tree = __get_kinetic_law(sbml_model, gillespy_model, reaction)
         propensity = __get_math(tree)
         reactants = {}
         products = {}
 
-        r_set = set()
-        p_set = set()
-        # get reactants
-        for j in range(reaction.getNumReactants()):
-            species = reaction.getReactant(j)
-            if species.getSpecies() == "EmptySet": continue
-            else:
-                if species.getSpecies() in r_set:
-                    reactants[species.getSpecies()] += species.getStoichiometry()
-                else:
-                    r_set.add(species.getSpecies())
-                    reactants[species.getSpecies()] = species.getStoichiometry()
-
-        # get products
-        for j in range(reaction.getNumProducts()):
-            species = reaction.getProduct(j)
-
-            if species.getSpecies() == "EmptySet": continue
-            else:
-                if species.getSpecies() in p_set:
-                    products[species.getSpecies()] += species.getStoichiometry()
-                else:
-                    p_set.add(species.getSpecies())
-                    products[species.getSpecies()] = species.getStoichiometry()
+        # get reactants and products, summing the stoichiometry of repeated species
+        for references, stoichiometry in ((reaction.getListOfReactants(), reactants),
+                                          (reaction.getListOfProducts(), products)):
+            for reference in references:
+                species = reference.getSpecies()
+                if species == "EmptySet": continue
+                stoichiometry[species] = stoichiometry.get(species, 0) + reference.getStoichiometry()
 
         gillespy_reaction = gillespy2.Reaction(name=name, reactants=reactants, products=products,
                                              propensity_function=propensity)
 
-        gillespy_model.add_reaction([gillespy_reaction])
+        gillespy_reactions.append(gillespy_reaction)
+    gillespy_model.add_reaction(gillespy_reactions)
 
-def __get_rules(sbml_model, gillespy_model, errors):
-    for i in range(sbml_model.getNumRules()):
-        rule = sbml_model.getRule(i)
+def __get_rules(sbml_model, gillespy_model, errors, init_state, postponed_evals):
+    for rule in sbml_model.getListOfRules():
 
         # If the SBML object does not contain an ID attribute create a unique rule_name from the variable name.
         rule_name = rule.getIdAttribute()
@@ -260,34 +260,21 @@ def __get_rules(sbml_model, gillespy_model, errors):
             gillespy_model.delete_parameter(rule_variable)
             gillespy_model.add_species([species])
 
-        t = []
-        
         if rule.isAssignment():
-            assign_value = eval(rule_string, {**eval_globals, **init_state})
             postponed_evals[rule_variable] = rule_string
             gillespy_rule = gillespy2.AssignmentRule(name=rule_name, variable=rule_variable,
                 formula=rule_string)
             gillespy_model.add_assignment_rule(gillespy_rule)
-            init_state[gillespy_rule.variable]=eval(gillespy_rule.formula, {**init_state, **eval_globals})
+            init_state[gillespy_rule.variable]=eval(__compile(gillespy_rule.formula), {**init_state, **eval_globals})
 
-        if rule.isRate():
+        elif rule.isRate():
             gillespy_rule = gillespy2.RateRule(name=rule_name, variable=rule_variable,
                 formula=rule_string)
             gillespy_model.add_rate_rule(gillespy_rule)
 
-        if rule.isAlgebraic():
-            t.append('algebraic')
-
-            if len(t) > 0:
-                t[0] = t[0].capitalize()
-
-                msg = ", ".join(t)
-                msg += " rule"
-            else:
-                msg = "Rule"
-
-            errors.append(["{0} '{1}' found on line '{2}' with equation '{3}'. gillespy does not support SBML Algebraic Rules".format(
-                msg, rule.getId(), rule.getLine(), libsbml.formulaToString(rule.getMath())), -5])
+        elif rule.isAlgebraic():
+            errors.append(["Algebraic rule '{0}' found on line '{1}' with equation '{2}'. gillespy does not support SBML Algebraic Rules".format(
+                rule.getId(), rule.getLine(), libsbml.formulaToString(rule.getMath())), -5])
 
 def __get_constraints(sbml_model, gillespy_model):
     for i in range(sbml_model.getNumConstraints()):
@@ -299,7 +286,7 @@ def __get_constraints(sbml_model, gillespy_model):
                               constraint.getId(), constraint.getLine(), libsbml.formulaToString(constraint.getMath())),
                           -5])
 
-def __get_function_definitions(sbml_model, gillespy_model):
+def __get_function_definitions(sbml_model, gillespy_model, init_state):
     # TODO:
     # DOES NOT CURRENTLY SUPPORT ALL MATHML 
     # ALSO DOES NOT SUPPORT NON-MATHML
@@ -315,16 +302,14 @@ def __get_function_definitions(sbml_model, gillespy_model):
         init_state[gillespy_function.name] = gillespy_function.function
 
 def __get_events(sbml_model, gillespy_model):
-    for i in range(sbml_model.getNumEvents()):
-        event = sbml_model.getEvent(i)
+    for event in sbml_model.getListOfEvents():
         gillespy_assignments = []
         
         trigger = event.getTrigger()
         delay = event.getDelay()
         if delay is not None:
-            delay = libsbml.formulaToL3String(delay.getMath())
-        expression=libsbml.formulaToL3String(trigger.getMath())
-        expression = expression.replace('&&', ' and ').replace('||', ' or ')
+            delay = __get_math(delay.getMath())
+        expression = __get_math(trigger.getMath())
         initial_value = trigger.getInitialValue()
         persistent = trigger.getPersistent()
         use_values_from_trigger_time = event.getUseValuesFromTriggerTime()
@@ -333,14 +318,16 @@ def __get_events(sbml_model, gillespy_model):
         assignments = event.getListOfEventAssignments()
         for a in assignments:
             # Convert Non-Constant Parameter to Species
-            if a.getVariable() in gillespy_model.listOfParameters:
-                gillespy_species = gillespy2.Species(name=a.getVariable(),
-                                                        initial_value=gillespy_model.listOfParameters[a.getVariable()].expression,
+            variable = a.getVariable()
+            parameter = gillespy_model.listOfParameters.get(variable)
+            if parameter is not None:
+                gillespy_species = gillespy2.Species(name=variable,
+                                                        initial_value=parameter.expression,
                                                         mode='continuous', allow_negative_populations=True)
-                gillespy_model.delete_parameter(a.getVariable())
+                gillespy_model.delete_parameter(variable)
                 gillespy_model.add_species([gillespy_species])
 
-            gillespy_assignment = gillespy2.EventAssignment(a.getVariable(),
+            gillespy_assignment = gillespy2.EventAssignment(variable,
                 __get_math(a.getMath()))
             gillespy_assignments.append(gillespy_assignment)
         gillespy_event = gillespy2.Event(
@@ -349,39 +336,72 @@ def __get_events(sbml_model, gillespy_model):
             use_values_from_trigger_time=use_values_from_trigger_time)
         gillespy_model.add_event(gillespy_event)
 
-def __get_initial_assignments(sbml_model, gillespy_model):
+def __get_initial_assignments(sbml_model, gillespy_model, init_state, postponed_evals):
 
     for i in range(sbml_model.getNumInitialAssignments()):
         ia = sbml_model.getInitialAssignment(i)
         variable = ia.getId()
         expression = __get_math(ia.getMath())
-        assigned_value = eval(expression, {**init_state, **eval_globals})
+        assigned_value = eval(__compile(expression), {**init_state, **eval_globals})
         init_state[variable] = assigned_value
         if assigned_value != assigned_value:
             assigned_value = expression
             postponed_evals[variable] = expression
 
-        if variable in gillespy_model.listOfSpecies:
-            gillespy_model.listOfSpecies[variable].initial_value = assigned_value
-        elif variable in gillespy_model.listOfParameters:
-            gillespy_model.listOfParameters[variable].set_expression(assigned_value)
-
-def __resolve_evals(gillespy_model, init_state):
+        species = gillespy_model.listOfSpecies.get(variable)
+        if species is not None:
+            species.initial_value = assigned_value
+        else:
+            parameter = gillespy_model.listOfParameters.get(variable)
+            if parameter is not None:
+                parameter.expression = str(assigned_value)
+
+def __resolve_eval(gillespy_model, init_state, postponed_evals, var):
+    # Evaluate a postponed expression, and record its value if it resolved to a number.
+    try: assigned_value = eval(__compile(postponed_evals[var]), {**eval_globals, **init_state})
+    except: assigned_value = np.nan
+    if assigned_value != assigned_value:
+        return False
+    init_state[var] = assigned_value
+    species = gillespy_model.listOfSpecies.get(var)
+    if species is not None:
+        species.initial_value = assigned_value
+    else:
+        parameter = gillespy_model.listOfParameters.get(var)
+        if parameter is not None:
+            parameter.value = assigned_value
+    del postponed_evals[var]
+    return True
+
+def __postponed_dependencies(var, expr, postponed_evals):
+    # A self-reference, such as a concentration converted to 'S * c', reads the current init_state value.
+    try: names = {node.id for node in ast.walk(ast.parse(expr, mode='eval')) if isinstance(node, ast.Name)}
+    except SyntaxError: names = set()
+    return (names - {var}) & postponed_evals.keys()
+
+def __resolve_evals(gillespy_model, init_state, postponed_evals):
+    # Evaluate each postponed expression once, after the postponed variables it references have been resolved.
+    dependencies = {
+        var: __postponed_dependencies(var, expr, postponed_evals) for var, expr in postponed_evals.items()
+    }
+    dependents = {}
+    for var, names in dependencies.items():
+        for name in names:
+            dependents.setdefault(name, []).append(var)
+    ready = deque(var for var, names in dependencies.items() if not names)
+    while ready:
+        var = ready.popleft()
+        if not __resolve_eval(gillespy_model, init_state, postponed_evals, var): continue
+        for dependent in dependents.get(var, ()):
+            dependencies[dependent].discard(var)
+            if not dependencies[dependent]:
+                ready.append(dependent)
+
+    # Expressions in dependency cycles, or depending on an expression which did not resolve, are retried until
+    # no further progress is made.
     while True:
-        successful = []
-        if len(postponed_evals):
-            for var, expr in postponed_evals.items():
-                try: assigned_value = eval(expr, {**eval_globals, **init_state})
-                except: assigned_value = np.nan
-                if assigned_value == assigned_value:
-                    successful.append(var)
-                    init_state[var] = assigned_value
-                    if var in gillespy_model.listOfSpecies:
-                        gillespy_model.listOfSpecies[var].initial_value = assigned_value
-                    elif var in gillespy_model.listOfParameters:
-                        gillespy_model.listOfParameters[var].value = assigned_value
+        successful = [var for var in list(postponed_evals) if __resolve_eval(gillespy_model, init_state, postponed_evals, var)]
         if not len(successful): break
-        for var in successful: del postponed_evals[var]
 
 def convert(filename, model_name=None, gillespy_model=None):
 
@@ -394,16 +414,20 @@ def convert(filename, model_name=None, gillespy_model=None):
         gillespy_model = gillespy2.Model(name=model_name)
     gillespy_model.units = "concentration"
 
-    __get_function_definitions(sbml_model, gillespy_model)
-    __get_parameters(sbml_model, gillespy_model)
-    __get_species(sbml_model, gillespy_model, errors)
-    __get_compartments(sbml_model, gillespy_model)
+    # Evaluation state is local to each conversion, so names from previously converted models do not leak in.
+    init_state = {'INF': np.inf, 'NaN': np.nan}
+    postponed_evals = {}
+
+    __get_function_definitions(sbml_model, gillespy_model, init_state)
+    __get_parameters(sbml_model, gillespy_model, init_state)
+    __get_species(sbml_model, gillespy_model, errors, init_state, postponed_evals)
+    __get_compartments(sbml_model, gillespy_model, init_state)
     __get_reactions(sbml_model, gillespy_model, errors)
-    __get_rules(sbml_model, gillespy_model, errors)
+    __get_rules(sbml_model, gillespy_model, errors, init_state, postponed_evals)
     __get_constraints(sbml_model, gillespy_model)
     __get_events(sbml_model, gillespy_model)
-    __get_initial_assignments(sbml_model, gillespy_model)
-    __resolve_evals(gillespy_model, init_state)
+    __get_initial_assignments(sbml_model, gillespy_model, init_state, postponed_evals)
+    __resolve_evals(gillespy_model, init_state, postponed_evals)
 
 
     return gillespy_model, errors
@@ -17,6 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import os
+import hashlib
 import shutil
 import tempfile
 from pathlib import Path
@@ -33,11 +34,13 @@ class BuildEngine():
     template_definitions_name = "template_definitions.h"
     template_options_name = "template_opts.h"
 
+    # The C++ source locations are fixed, so they are resolved once rather than for every engine.
+    self_dir = Path(__file__).parent
+    cpp_dir = self_dir.joinpath("../c_base").resolve()
+    makefile = cpp_dir.joinpath("Makefile")
+    src_template_dir = cpp_dir.joinpath("template")
+
     def __init__(self, debug: bool = False, output_dir: str = None):
-        self.self_dir = Path(__file__).parent
-        self.cpp_dir = self.self_dir.joinpath("../c_base").resolve()
-        self.makefile = self.cpp_dir.joinpath("Makefile")
-        self.src_template_dir = self.cpp_dir.joinpath("template")
         self.output_dir = output_dir
 
         self.debug = debug
@@ -46,14 +49,12 @@ class BuildEngine():
         # Output files are all rooted relative to the output_dir.
         if self.output_dir is not None:
             self.output_dir = Path(output_dir)
-
-            if not self.output_dir.is_dir():
-                self.output_dir.mkdir(parents=True)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def __get_cache_dir(self) -> Path:
-        cache_dir = gillespy2._global_cache
+        cache_dir = getattr(gillespy2, "_global_cache", None)
 
-        if not cache_dir.is_dir() or not os.access(str(cache_dir), os.R_OK):
+        if cache_dir is None or not cache_dir.is_dir() or not os.access(str(cache_dir), os.R_OK):
             cache_dir = Path(os.path.expanduser("~"), ".gillespy2", "cache")
 
         return cache_dir
@@ -104,11 +105,15 @@ class BuildEngine():
         if gillespy2.cache_enabled:
             self.obj_dir = self.__get_cache_dir()
 
-        if not self.obj_dir.is_dir():
-            self.obj_dir.mkdir(parents=True)
+        self.obj_dir.mkdir(parents=True, exist_ok=True)
 
-        # Copy the C++ template directory to the temp directory.
-        shutil.copytree(self.src_template_dir, self.template_dir)
+        # Copy the C++ template directory to the temp directory. The template files are hard linked rather than
+        # copied where possible; the only files rewritten below are unlinked first, so the sources are never modified.
+        try:
+            shutil.copytree(self.src_template_dir, self.template_dir, copy_function=os.link)
+        except OSError:
+            shutil.rmtree(self.template_dir, ignore_errors=True)
+            shutil.copytree(self.src_template_dir, self.template_dir)
 
         # If a raw GillesPy2 model was provided, convert it to a sanitized model.
         if isinstance(model, gillespy2.Model):
@@ -161,9 +166,41 @@ class BuildEngine():
                 "To fix, call `BuildEngine.prepare()` prior to attempting to build the simulation."
             )
 
+        # With the cache enabled, an executable built from identical template definitions is reused.
+        cached_file = self.__get_cached_simulation(simulation_name) if gillespy2.cache_enabled else None
+        if cached_file is not None and cached_file.is_file():
+            shutil.copy2(cached_file, self.make.output_file)
+            return str(self.make.output_file)
+
         self.make.build_simulation(simulation_name, template_dir=str(self.template_dir))
+
+        if cached_file is not None:
+            cached_file.parent.mkdir(parents=True, exist_ok=True)
+            # Copy under a temporary name first, so that concurrent builds never see a partial executable.
+            partial_file = cached_file.with_name(f"{cached_file.name}.{os.getpid()}.tmp")
+            shutil.copy2(self.make.output_file, partial_file)
+            os.replace(partial_file, cached_file)
+
         return str(self.make.output_file)
 
+    def __get_cached_simulation(self, simulation_name: str) -> Path:
+        """
+        Resolves the cache path of the executable for the given simulation and the prepared template.
+        The path is keyed on the GillesPy2 version, the simulation target, the C++ sources and the generated
+        template headers, so that edited sources are rebuilt even without a version change.
+        """
+        digest = hashlib.sha256(f"{gillespy2.__version__}:{simulation_name}".encode())
+        for source_file in sorted(path for path in self.cpp_dir.rglob("*") if path.is_file()):
+            digest.update(b"\0")
+            digest.update(source_file.relative_to(self.cpp_dir).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(source_file.read_bytes())
+        for header_name in (self.template_definitions_name, self.template_options_name):
+            digest.update(b"\0")
+            digest.update(self.template_dir.joinpath(header_name).read_bytes())
+
+        return self.obj_dir.joinpath("simulations", f"{digest.hexdigest()}{self.make.output_file.suffix}")
+
     def get_executable_path(self) -> str:
         """
         Resolves the filepath of the simulation executable.
@@ -16,7 +16,6 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from collections import OrderedDict
 from typing import Optional
 from gillespy2.core import Species, Reaction, Parameter, Model, RateRule
 from gillespy2.solvers.cpp.build.expression import Expression
@@ -50,18 +49,18 @@ class SanitizedModel:
         self.model = model
         self.variable = variable
 
-        self.species: "OrderedDict[str, Species]" = OrderedDict()
+        self.species: "dict[str, Species]" = {}
         self.species_names = model.sanitized_species_names()
-        self.species_id: "OrderedDict[str, int]" = OrderedDict()
+        self.species_id: "dict[str, int]" = {}
         for spec_id, spec_entry in enumerate(self.species_names.items()):
             species_name, sanitized_name = spec_entry
             self.species[sanitized_name] = model.get_species(species_name)
             self.species_id[species_name] = spec_id
 
-        self.parameters: "OrderedDict[str, Parameter]" = OrderedDict()
-        self.parameter_names: "OrderedDict[str, str]" = OrderedDict()
+        self.parameters: "dict[str, Parameter]" = {}
+        self.parameter_names: "dict[str, str]" = {}
         self.parameter_names["vol"] = "P[0]" if variable else "C[0]"
-        self.parameter_id: "OrderedDict[str, int]" = OrderedDict()
+        self.parameter_id: "dict[str, int]" = {}
         for param_id, param_name in enumerate(model.listOfParameters.keys(), start=1):
             if param_name not in self.parameter_names:
                 self.parameter_names[param_name] = f"P[{param_id}]" if variable else f"C[{param_id}]"
@@ -83,17 +82,19 @@ class SanitizedModel:
         self.expr = Expression(namespace=base_namespace, blacklist=["="], sanitize=True)
 
         # SSA Propensities: Maps reaction names to their corresponding propensity function.
-        self.propensities: "OrderedDict[str, str]" = OrderedDict()
+        self.propensities: "dict[str, str]" = {}
         # ODE Propensities: Maps reaction names to their corresponding mass-action rate expression.
-        self.ode_propensities: "OrderedDict[str, str]" = OrderedDict()
+        self.ode_propensities: "dict[str, str]" = {}
         # Reactions: maps reaction names to their stoichiometry matrix.
         # Stoichiometry matrix maps a sanitized species name to its stoichiometry.
-        self.reactions: "OrderedDict[str, dict[str, int]]" = OrderedDict()
+        self.reactions: "dict[str, dict[str, int]]" = {}
         # Rate Rules: maps sanitized species names to their corresponding rate rule expression.
-        self.rate_rules: "OrderedDict[str, str]" = OrderedDict()
+        self.rate_rules: "dict[str, str]" = {}
         # Options: custom definitions that can be supplied by the solver, maps macros to their definitions.
         # The solver itself may use `options` to supply their own solver-specific definitions.
-        self.options: "OrderedDict[str, str]" = OrderedDict()
+        self.options: "dict[str, str]" = {}
+        # Maps propensity expressions to their C++ conversions, so identical expressions are only parsed once.
+        self.__cpp_propensities: "dict[str, str]" = {}
 
         for reaction in model.get_all_reactions().values():
             self.use_reaction(reaction)
@@ -113,7 +114,11 @@ class SanitizedModel:
         """
         propensities = self.ode_propensities if ode else self.propensities
         propensity = reaction.ode_propensity_function if ode else reaction.propensity_function
-        propensities[reaction.name] = self.expr.getexpr_cpp(propensity)
+        cpp_propensity = self.__cpp_propensities.get(propensity)
+        if cpp_propensity is None:
+            cpp_propensity = self.expr.getexpr_cpp(propensity)
+            self.__cpp_propensities[propensity] = cpp_propensity
+        propensities[reaction.name] = cpp_propensity
 
     def use_reaction(self, reaction: "Reaction") -> "SanitizedModel":
         """
@@ -123,7 +128,7 @@ class SanitizedModel:
         :param reaction: Reaction to add to the sanitized model.
         :type reaction: gillespy2.Reaction
         """
-        self.reactions[reaction.name] = {spec: int(0) for spec in self.species_names.values()}
+        self.reactions[reaction.name] = dict.fromkeys(self.species_names.values(), 0)
         for reactant, stoich_value in reaction.reactants.items():
             if isinstance(reactant, Species):
                 reactant = self.species_names[reactant.name]
@@ -194,16 +199,10 @@ class SanitizedModel:
         species_definitions = template_def_species(self)
         results.update(species_definitions)
 
-        # Get definitions for reactions
-        reaction_definitions = template_def_reactions(self)
+        # Get definitions for reactions and both sets of propensities
+        reaction_definitions = template_def_reactions_and_propensities(self)
         results.update(reaction_definitions)
 
-        # Get definitions for propensities
-        stoch_propensity_definitions = template_def_propensities(self, ode=False)
-        ode_propensity_definitions = template_def_propensities(self, ode=True)
-        results.update(stoch_propensity_definitions)
-        results.update(ode_propensity_definitions)
-
         return results
 
     def get_options(self) -> "Optional[dict[str, str]]":
@@ -271,28 +270,7 @@ def get_model_defines(model: Model, variable=False) -> "dict[str, str]":
 
     :returns: Dictionary of fully-formatted macro definitions.
     """
-    results = {}
-    sanitized_model = SanitizedModel(model)
-
-    # Get definitions for variables
-    parameter_definitions = template_def_variables(sanitized_model, variable)
-    results.update(parameter_definitions)
-
-    # Get definitions for species
-    species_definitions = template_def_species(sanitized_model)
-    results.update(species_definitions)
-
-    # Get definitions for reactions
-    reaction_definitions = template_def_reactions(sanitized_model)
-    results.update(reaction_definitions)
-
-    # Get definitions for propensities
-    stoch_propensity_definitions = template_def_propensities(sanitized_model, ode=False)
-    ode_propensity_definitions = template_def_propensities(sanitized_model, ode=True)
-    results.update(stoch_propensity_definitions)
-    results.update(ode_propensity_definitions)
-
-    return results
+    return SanitizedModel(model, variable=variable).get_template()
 
 
 def update_model_options(model: "SanitizedModel", definitions: "dict[str, str]" = None) -> "dict[str, str]":
@@ -375,13 +353,10 @@ def template_def_species(model: SanitizedModel) -> "dict[str, str]":
     """
     # Parse and format species initial populations
     num_species = len(model.species)
-    populations = OrderedDict()
-
-    for spec_name, spec in model.species.items():
-        populations[spec_name] = str(float(spec.initial_value))
+    populations = [str(float(spec.initial_value)) for spec in model.species.values()]
     # Species names, parsed and formatted
-    sanitized_names = [f"SPECIES_NAME({name})" for name in populations.keys()]
-    populations = f"{{{','.join(populations.values())}}}"
+    sanitized_names = [f"SPECIES_NAME({name})" for name in model.species.keys()]
+    populations = f"{{{','.join(populations)}}}"
 
     # Match each parameter with its macro definition name
     return {
@@ -402,10 +377,11 @@ def template_def_reactions(model: SanitizedModel, ode=False) -> "dict[str, str]"
     :returns: Dictionary of macro definitions for reactions.
     """
     num_reactions = str(len(model.reactions))
-    reaction_set = OrderedDict()
+    species_names = tuple(model.species_names.values())
+    reaction_set = {}
 
     for rxn_name, reaction in model.reactions.items():
-        stoich = [str(int(reaction[species])) for species in model.species_names.values()]
+        stoich = [str(reaction[species]) for species in species_names]
         reaction_set[rxn_name] = f"{{{','.join(stoich)}}}"
 
     reaction_names = " ".join([f"REACTION_NAME({rxn})" for rxn in reaction_set.keys()])
@@ -418,6 +394,46 @@ def template_def_reactions(model: SanitizedModel, ode=False) -> "dict[str, str]"
     }
 
 
+def template_def_reactions_and_propensities(model: SanitizedModel) -> "dict[str, str]":
+    """
+    Formats the reactions, stochastic propensities and ODE propensities of the model in a single pass.
+    Produces the same definitions as `template_def_reactions` and both variants of `template_def_propensities`,
+    along with the species each stochastic propensity depends on.
+
+    :param model: Sanitized model containing runtime definitions.
+    :type model: SanitizedModel
+
+    :returns: Dictionary of macro definitions for reactions and propensities.
+    """
+    species_names = tuple(model.species_names.values())
+    propensities = model.propensities
+    ode_propensities = model.ode_propensities
+    reaction_set = []
+    dependency_set = []
+    reaction_names = []
+    propensity_set = []
+    ode_propensity_set = []
+
+    for rxn_i, (rxn_name, reaction) in enumerate(model.reactions.items()):
+        stoich = ",".join([str(reaction[species]) for species in species_names])
+        reaction_set.append(f"{{{stoich}}}")
+        # Sanitized species names are bracketed (S[0], S[1], ...), so a substring test can not mismatch.
+        dependencies = ",".join(["1" if species in propensities[rxn_name] else "0" for species in species_names])
+        dependency_set.append(f"{{{dependencies}}}")
+        reaction_names.append(f"REACTION_NAME({rxn_name})")
+        propensity_set.append(f"PROPENSITY({rxn_i},{propensities[rxn_name]})")
+        ode_propensity_set.append(f"PROPENSITY({rxn_i},{ode_propensities[rxn_name]})")
+
+    return {
+        "GPY_NUM_REACTIONS": str(len(reaction_set)),
+        "GPY_REACTIONS": f"{{{','.join(reaction_set)}}}",
+        "GPY_REACTION_DEPENDENCIES": f"{{{','.join(dependency_set)}}}",
+        "GPY_REACTION_NAMES": " ".join(reaction_names),
+        "GPY_PROPENSITIES": " ".join(propensity_set),
+        "GPY_ODE_PROPENSITIES": " ".join(ode_propensity_set),
+    }
+
+
 def template_def_propensities(model: SanitizedModel, ode=False) -> "dict[str, str]":
     """
     Formats the given list of pre-sorted, pre-sanitized propensities.
@@ -46,9 +46,12 @@ namespace Gillespy {
 		for (unsigned int reaction = 0; reaction < number_reactions; reaction++) {
 			reactions[reaction].name = reaction_names[reaction];
 			reactions[reaction].species_change = std::make_unique<int[]>(number_species);
+			reactions[reaction].species_dependencies = std::make_unique<int[]>(number_species);
 
 			for (unsigned int species = 0; species < number_species; species++) {
 				reactions[reaction].species_change[species] = 0;
+				// Without dependency information, assume every propensity depends on every species.
+				reactions[reaction].species_dependencies[species] = 1;
 			}
 
 			reactions[reaction].affected_reactions = std::vector<unsigned int>();
@@ -62,12 +65,13 @@ namespace Gillespy {
 			reactions[i].affected_reactions.clear();
 		}
 
-		// Check all reactions for commong species changes -> affected reactions.
+		// Firing r1 affects r2 if r1 changes a species which r2's propensity depends on.
 		for (unsigned int r1 = 0; r1 < number_reactions; r1++) {
 			for (unsigned int r2 = 0; r2 < number_reactions; r2++) {
 				for (unsigned int s = 0; s < number_species; s++) {
-					if (reactions[r2].species_change[s] != 0) {
+					if (reactions[r1].species_change[s] != 0 && reactions[r2].species_dependencies[s] != 0) {
 						reactions[r1].affected_reactions.push_back(r2);
+						break;
 					}
 				}
 			}
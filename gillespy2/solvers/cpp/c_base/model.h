@@ -73,6 +73,9 @@ namespace Gillespy
 		// List of reactions who's propensities will change when this reaction fires.
 		std::unique_ptr<int[]> species_change;
 
+		// Nonzero for each species this reaction's propensity depends on.
+		std::unique_ptr<int[]> species_dependencies;
+
 		inline static double propensity(
 				ReactionId reaction_id,
 				double *state,
@@ -49,6 +49,9 @@ namespace Gillespy
 		s_names + sizeof(s_names) / sizeof(std::string));
 
 	int reactions[GPY_NUM_REACTIONS][GPY_NUM_SPECIES] = GPY_REACTIONS;
+#ifdef GPY_REACTION_DEPENDENCIES
+	int reaction_dependencies[GPY_NUM_REACTIONS][GPY_NUM_SPECIES] = GPY_REACTION_DEPENDENCIES;
+#endif
 	std::string r_names[GPY_NUM_REACTIONS] = 
 	{
 		#define REACTION_NAME(name) #name,
@@ -241,6 +244,9 @@ namespace Gillespy
 			for (spec_i = 0; spec_i < GPY_NUM_SPECIES; ++spec_i)
 			{
 				model.reactions[rxn_i].species_change[spec_i] = reactions[rxn_i][spec_i];
+#ifdef GPY_REACTION_DEPENDENCIES
+				model.reactions[rxn_i].species_dependencies[spec_i] = reaction_dependencies[rxn_i][spec_i];
+#endif
 			}
 		}
 
@@ -77,6 +77,17 @@
  *   The number of reactions in the first dimension of GPY_REACTION must match GPY_NUM_REACTIONS.
  *   The number of species changes in each reaction's change list must match GPY_NUM_SPECIES.
  * 
+ *******************************************************************************
+ *** GPY_REACTION_DEPENDENCIES: species each reaction's propensity depends on. ***
+ * 
+ *   Example:
+ *     #define GPY_REACTION_DEPENDENCIES { {0, 1, 1}, {1, 0, 0}, {0, 0, 1} }
+ * 
+ *   Has the same shape as GPY_REACTIONS.
+ *   A nonzero entry means the propensity of reaction R_i reads species S_j,
+ *     so it must be recomputed whenever a reaction changes S_j.
+ *   Optional; if omitted, every propensity is assumed to depend on every species.
+ * 
  ****************************************************************************
  *** GPY_SPECIES_NAMES: list of strings representing names of species.    ***
  *** GPY_REACTION_NAMES: list of strings representing names of reactions. ***
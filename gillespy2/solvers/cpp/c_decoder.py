@@ -134,18 +134,10 @@ class BasicSimDecoder(SimDecoder):
         #  1D: index to each simulation trajectory
         #  2D: index to each timestep of that directory
         #  3D: index to each species of that timestep
-        # Buffer is a flat 1D list, which gets mapped into the NumPy array.
-        for entry_i, entry in enumerate(stdout):
-            spec_num = entry_i % self.num_species
-
-            # Each timestep has a "stride" equal to the total number of species.
-            entry_i //= self.num_species
-            ts_num = entry_i % self.num_timesteps
-
-            # Each trajectory has a "stride" equal to the total number of timesteps.
-            traj_num = entry_i // self.num_timesteps
-
-            self.trajectories[traj_num][ts_num][spec_num] = entry
+        # Buffer is a flat 1D list, laid out in the same (row-major) order as the NumPy array.
+        # It is converted and copied into the front of the array in a single assignment.
+        if len(stdout) > 0:
+            self.trajectories.reshape(-1)[:len(stdout)] = numpy.array(stdout, dtype=float)
 
         return self.trajectories, time_stopped
 
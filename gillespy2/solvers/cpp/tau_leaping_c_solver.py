@@ -45,7 +45,7 @@ class TauLeapingCSolver(GillesPySolver, CSolver):
             if model is None:
                 raise SimulationError("A model is required to run the simulation.")
             self._set_model(model=model)
-        if model is not None and model.get_json_hash() != self.model.get_json_hash():
+        if model is not None and model is not self.model and model.get_json_hash() != self.model.get_json_hash():
             raise SimulationError("Model must equal TauLeapingCSolver.model.")
         self.model.resolve_parameters()
         self.validate_sbml_features(model=model)
@@ -154,7 +154,7 @@ class CLESolver(GillesPySolver):
             if model is None:
                 raise SimulationError("A model is required to run the simulation.")
             self.model = model
-        if model is not None and model.get_json_hash() != self.model.get_json_hash():
+        if model is not None and model is not self.model and model.get_json_hash() != self.model.get_json_hash():
             raise SimulationError("Model must equal CLESolver.model.")
         self.model.resolve_parameters()
         self.validate_sbml_features(model=model)
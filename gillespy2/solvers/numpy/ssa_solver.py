@@ -80,7 +80,7 @@ class NumPySSASolver(GillesPySolver):
             self.model = model
 
         try:
-            if model is not None and model.get_json_hash() != self.model.get_json_hash():
+            if model is not None and model is not self.model and model.get_json_hash() != self.model.get_json_hash():
                 raise SimulationError("Model must equal NumPySSASolver.model.")
         except:
             pass
@@ -22,6 +22,7 @@ from scipy.integrate import ode, LSODA
 import heapq
 import numpy as np
 import threading
+from functools import lru_cache
 import gillespy2
 from gillespy2.solvers.utilities import Tau
 from gillespy2.core import GillesPySolver, log, Event, RateRule, AssignmentRule, FunctionDefinition
@@ -59,6 +60,14 @@ eval_globals['piecewise'] = __piecewise
 eval_globals['xor'] = __xor
 
 
+@lru_cache(maxsize=1024)
+def _compile_event_expression(expression):
+    # Event triggers and delays are re-evaluated on every integrator step,
+    # so each distinct expression string is only parsed once.
+    # eval() ignores leading spaces and tabs in source strings, compile() does not.
+    return compile(expression.lstrip(' \t'), '<string>', 'eval')
+
+
 class TauHybridSolver(GillesPySolver):
     """
     This Solver uses a root-finding interpretation of the direct SSA method,
@@ -254,7 +263,7 @@ class TauHybridSolver(GillesPySolver):
             propensities[r] = eval(compiled_reactions[r], {**eval_globals, **curr_state})
             state_change[y_map[r]] += propensities[r]
         for event in events:
-            triggered = eval(event.trigger.expression, {**eval_globals, **curr_state})
+            triggered = eval(_compile_event_expression(event.trigger.expression), {**eval_globals, **curr_state})
             if triggered: 
                 state_change[y_map[event]] = 1
 
@@ -383,7 +392,7 @@ class TauHybridSolver(GillesPySolver):
         else:
             curr_state['t'] = curr_time
             curr_state['time'] = curr_time
-            execution_time = curr_time + eval(event.delay, {**eval_globals, **curr_state})
+            execution_time = curr_time + eval(_compile_event_expression(event.delay), {**eval_globals, **curr_state})
             curr_state[event.name] = True
             heapq.heappush(delayed_events, (execution_time, event.name))
             if event.use_values_from_trigger_time:
@@ -401,14 +410,14 @@ class TauHybridSolver(GillesPySolver):
         t0_delayed_events = {}
         for e in self.model.listOfEvents.values():
             if not e.trigger.value:
-                t0_firing = eval(e.trigger.expression, {**eval_globals, **initial_state})
+                t0_firing = eval(_compile_event_expression(e.trigger.expression), {**eval_globals, **initial_state})
                 if t0_firing:
                     if e.delay is None:
                         for a in e.assignments:
                             initial_state[a.variable.name] = eval(a.expression, {**eval_globals, **initial_state})
                             species_modified_by_events.append(a.variable.name)
                     else:
-                        execution_time = eval(e.delay, {**eval_globals, **initial_state})
+                        execution_time = eval(_compile_event_expression(e.delay), {**eval_globals, **initial_state})
                         t0_delayed_events[e.name] = execution_time
         return t0_delayed_events, species_modified_by_events
 
@@ -640,7 +649,7 @@ class TauHybridSolver(GillesPySolver):
         while event_cycle:
             event_cycle = False
             for i, e in enumerate(self.model.listOfEvents.values()):
-                triggered = eval(e.trigger.expression, {**eval_globals, **curr_state})
+                triggered = eval(_compile_event_expression(e.trigger.expression), {**eval_globals, **curr_state})
                 if triggered and not curr_state[e.name]:
                     curr_state[e.name] = True
                     self.__handle_event(e, curr_state, curr_time,
@@ -833,7 +842,7 @@ class TauHybridSolver(GillesPySolver):
             if model is None:
                 raise SimulationError("A model is required to run the simulation.")
             self.model = model
-        if model is not None and model.get_json_hash() != self.model.get_json_hash():
+        if model is not None and model is not self.model and model.get_json_hash() != self.model.get_json_hash():
             raise SimulationError("Model must equal TauHybridSolver.model.")
         self.model.resolve_parameters()
         self.validate_sbml_features(model=model)
@@ -69,10 +69,9 @@ class TauLeapingSolver(GillesPySolver):
         if self.debug:
             print("Curr Time: ", curr_time, " Save time: ", save_time, "step: ", step)
 
-        rxn_count = {}
-
-        for rxn in reactions:
-            rxn_count[rxn] = np.random.poisson(propensities[rxn] * step)
+        # A single vectorized draw consumes the random stream in the same order as one draw per reaction.
+        firings = np.random.poisson([propensities[rxn] * step for rxn in reactions]).tolist()
+        rxn_count = dict(zip(reactions, firings))
 
         if self.debug:
             print("Reactions Fired: ", rxn_count)
@@ -141,7 +140,7 @@ class TauLeapingSolver(GillesPySolver):
             if model is None:
                 raise SimulationError("A model is required to run the simulation.")
             self.model = model
-        if model is not None and model.get_json_hash() != self.model.get_json_hash():
+        if model is not None and model is not self.model and model.get_json_hash() != self.model.get_json_hash():
             raise SimulationError("Model must equal TauLeapingSolver.model.")
         self.model.resolve_parameters()
         self.validate_sbml_features(model=model)
@@ -21,6 +21,11 @@ import numpy as np
 from gillespy2.core import log, Species
 from gillespy2.core import ModelError
 
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
 """
 NUMPY SOLVER UTILITIES BELOW
 """
@@ -82,6 +87,76 @@ def numpy_resume(timeStopped, simulation_data, resume=None):
 
     return simulation_data
 
+
+def numpy_tau_leap_ensemble(model, timeline, number_of_trajectories, tau, seed=None, use_gpu=False,
+                            dtype=np.float64):
+    """
+    Simulate an ensemble of trajectories of a mass-action model with fixed step tau-leaping. Each step
+    advances every trajectory at once, using the model's stoichiometry arrays (see Model.to_soa()).
+    Populations which a leap would make negative are clipped to zero.
+
+    :param model: The model to simulate. All of its reactions must be mass-action reactions.
+    :type model: gillespy2.Model
+
+    :param timeline: The increasing times at which the species populations are recorded.
+    :type timeline: numpy.ndarray
+
+    :param number_of_trajectories: The number of trajectories to simulate.
+    :type number_of_trajectories: int
+
+    :param tau: The maximum size of a leap.
+    :type tau: float
+
+    :param seed: The seed for the random number generator.
+    :type seed: int
+
+    :param use_gpu: If True and CuPy is installed, the ensemble is simulated on the GPU.
+    :type use_gpu: bool
+
+    :param dtype: The dtype of the returned trajectories. numpy.float32 halves the size of large ensembles,
+        and represents populations exactly up to 2**24.
+    :type dtype: numpy.dtype
+
+    :returns: numpy.ndarray of shape (number_of_trajectories, timeline.size, number of species).
+    """
+    soa = model.to_soa()
+    if np.isnan(soa['k']).any():
+        raise ModelError("Ensemble tau-leaping requires all reactions to be mass-action reactions.")
+    reactant_powers = model.reactant_power_matrix
+    if (reactant_powers > 2).any():
+        raise ModelError("Ensemble tau-leaping requires each reactant to appear at most twice in a reaction.")
+
+    if use_gpu and cupy is None:
+        log.warning("CuPy is not installed, the ensemble will be simulated on the CPU.")
+    xp = cupy if use_gpu and cupy is not None else np
+
+    rng = xp.random.RandomState(seed)
+    nu = xp.asarray(soa['nu'], dtype=xp.float64)
+    powers = xp.asarray(reactant_powers)
+    # Mass-action propensities scale with vol ** (1 - order); see Reaction.create_mass_action().
+    rates = xp.asarray(soa['k'] * float(model.volume) ** (1 - reactant_powers.sum(axis=1)))
+
+    state = xp.tile(xp.asarray(soa['x0']), (number_of_trajectories, 1))
+    trajectories = xp.empty((number_of_trajectories, len(timeline), state.shape[1]), dtype=dtype)
+    trajectories[:, 0] = state
+
+    curr_time = timeline[0]
+    for entry_count in range(1, len(timeline)):
+        while curr_time < timeline[entry_count]:
+            tau_step = min(tau, timeline[entry_count] - curr_time)
+
+            # Reactant powers are at most 2, so each species contributes 1, X, or X * (X - 1) / 2.
+            populations = state[:, None, :]
+            factors = xp.where(powers == 1, populations, populations * (populations - 1) / 2)
+            propensities = rates * xp.prod(xp.where(powers == 0, 1.0, factors), axis=2)
+
+            firings = rng.poisson(xp.maximum(propensities, 0) * tau_step)
+            state = xp.maximum(state + firings @ nu, 0)
+            curr_time += tau_step
+        trajectories[:, entry_count] = state
+
+    return cupy.asnumpy(trajectories) if xp is not np else trajectories
+
 """
 VARIABLE SOLVER METHODS
 """
@@ -89,43 +164,29 @@ VARIABLE SOLVER METHODS
 
 def update_species_init_values(listOfSpecies, species, variables, resume = None):
     # Update Species Initial Values
-    populations = ''
-    for i in range(len(species) - 1):
-        if species[i] in variables:
-            populations += '{} '.format(float(variables[species[i]]))
+    populations = []
+    for name in species:
+        if name in variables:
+            value = variables[name]
+        elif resume is not None:
+            value = resume[name][-1]
         else:
-            if resume is not None:
-                populations += '{} '.format(float(resume[species[i]][-1]))
-            else:
-                populations += '{} '.format(float(listOfSpecies[species[i]].initial_value))
-    if species[-1] in variables:
-        populations += '{}'.format(float(variables[species[-1]]))
-    else:
-        if resume is not None:
-            populations += '{} '.format(float(resume[species[-1]][-1]))
-        else:
-            populations += '{}'.format(float(listOfSpecies[species[-1]].initial_value))
-    return populations
+            value = listOfSpecies[name].initial_value
+        populations.append(str(float(value)))
+    return ' '.join(populations)
 
 def change_param_values(listOfParameters, parameters, volume, variables):
     # Update Parameter Values
-    parameter_values = ''
-    for i in range(len(parameters) - 1):
-        if parameters[i] in variables:
-            parameter_values += '{} '.format(variables[parameters[i]])
-        else:
-            if parameters[i] == 'vol':
-                parameter_values += '{} '.format(volume)
-            else:
-                parameter_values += '{} '.format(listOfParameters[parameters[i]].expression)
-    if parameters[-1] in variables:
-        parameter_values += '{}'.format(variables[parameters[-1]])
-    else:
-        if parameters[-1] == 'vol':
-            parameter_values += '{}'.format(volume)
+    parameter_values = []
+    for name in parameters:
+        if name in variables:
+            value = variables[name]
+        elif name == 'vol':
+            value = volume
         else:
-            parameter_values += '{}'.format(listOfParameters[parameters[-1]].expression)
-    return parameter_values
+            value = listOfParameters[name].expression
+        parameter_values.append(str(value))
+    return ' '.join(parameter_values)
 
 """
 Below are two functions used for creating dependency graphs in the C solvers, and Numpy Solvers.
@@ -106,5 +106,8 @@ setup(name                 = version['__title__'].lower(),
               'python_libsbml',
               'lxml',
           ],
+          'blake3': [
+              'blake3',
+          ],
       },
 )
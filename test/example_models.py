@@ -332,8 +332,8 @@ class ToggleSwitch(Model):
         # Reactions
         self.add_reaction(Reaction(name="cu", reactants={}, products={'A': 1}, propensity_function="alpha1/(1+pow(B, beta))"))
         self.add_reaction(Reaction(name="cv", reactants={}, products={'B': 1}, propensity_function="alpha2/(1+pow(A, gamma))"))
-        self.add_reaction(Reaction(name="du", reactants={'A': 1}, products={}, rate=self.listOfParameters["mu"]))
-        self.add_reaction(Reaction(name="dv", reactants={'B': 1}, products={}, rate=self.listOfParameters["mu"]))
+        self.add_reaction(Reaction(name="du", reactants={'A': 1}, products={}, rate=mu))
+        self.add_reaction(Reaction(name="dv", reactants={'B': 1}, products={}, rate=mu))
         self.timespan(np.linspace(0, 250, 251))
 
 
@@ -492,16 +492,17 @@ class RobustModel(Model):
         self.volume = 1
 
         # Parameters
-        self.add_parameter(Parameter(name="k1", expression="0.5"))
-        self.add_parameter(Parameter(name="k2", expression="3.2e-15"))
+        k1 = Parameter(name="k1", expression="0.5")
+        k2 = Parameter(name="k2", expression="3.2e-15")
+        self.add_parameter([k1, k2])
 
         # Variables
         self.add_species(Species(name="s1", initial_value=8000, mode="continuous"))
         self.add_species(Species(name="s2", initial_value=0, mode="continuous"))
 
         # Reactions
-        self.add_reaction(Reaction(name="r1", reactants={'s1': 1}, products={'s2': 1}, rate=self.listOfParameters["k2"]))
-        self.add_reaction(Reaction(name="r2", reactants={'s1': 1}, products={}, rate=self.listOfParameters["k1"]))
+        self.add_reaction(Reaction(name="r1", reactants={'s1': 1}, products={'s2': 1}, rate=k2))
+        self.add_reaction(Reaction(name="r2", reactants={'s1': 1}, products={}, rate=k1))
         self.add_reaction(Reaction(name="r3", reactants={'s1': 2}, products={'s1': 3}, propensity_function="sin(1)"))
 
         # Event Triggers
@@ -18,12 +18,15 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
 import tempfile
+import importlib
 import os
 import re
+import sys
+from unittest import mock
 from example_models import RobustModel
 from gillespy2.core.model import import_SBML, export_SBML
 from gillespy2.core import gillespyError
-from gillespy2 import ODESolver
+from gillespy2 import ODESolver, Model, Species, Parameter
 
 
 class TestSBML(unittest.TestCase):
@@ -100,6 +103,62 @@ class TestSBML(unittest.TestCase):
 
         self.fail()
 
+    @staticmethod
+    def import_sbml_module():
+        try:
+            import libsbml
+        except ImportError:
+            libsbml = mock.MagicMock()
+        with mock.patch.dict(sys.modules, {"libsbml": libsbml}):
+            return importlib.import_module("gillespy2.sbml.SBMLimport")
+
+    def test_resolve_postponed_evals(self):
+        """
+        Ensure that postponed expressions are resolved after the expressions they read, including a
+        concentration species which is converted in place.
+        """
+        # The resolution pass does not call into libsbml, so it is stubbed when not installed.
+        resolve_evals = getattr(self.import_sbml_module(), "__resolve_evals")
+
+        model = Model()
+        model.add_species([Species(name="A", initial_value=3), Species(name="S", initial_value=2)])
+        model.add_parameter(Parameter(name="c", expression=10))
+        init_state = {"A": 3, "S": 2, "c": 10}
+        postponed_evals = {"A": "S + 1", "S": "S * c"}
+        resolve_evals(model, init_state, postponed_evals)
+
+        self.assertEqual(postponed_evals, {})
+        self.assertEqual(init_state["S"], 20)
+        self.assertEqual(init_state["A"], 21)
+        self.assertEqual(model.listOfSpecies["A"].initial_value, 21)
+
+    def test_event_math_conversion(self):
+        """
+        Ensure that event triggers and delays are both converted from SBML formula syntax.
+        """
+        SBMLimport = self.import_sbml_module()
+        get_events = getattr(SBMLimport, "__get_events")
+
+        # The SBML event is mocked, with each formula standing in for its math node.
+        event = mock.MagicMock()
+        event.getId.return_value = "e1"
+        event.getTrigger().getMath.return_value = "t > 2^3"
+        event.getDelay().getMath.return_value = "2^2"
+        event.getTrigger().getInitialValue.return_value = False
+        event.getTrigger().getPersistent.return_value = True
+        event.getUseValuesFromTriggerTime.return_value = True
+        event.getListOfEventAssignments.return_value = []
+        sbml_model = mock.MagicMock()
+        sbml_model.getListOfEvents.return_value = [event]
+
+        model = Model()
+        with mock.patch.object(SBMLimport, "libsbml") as libsbml:
+            libsbml.formulaToL3String.side_effect = lambda math: math
+            get_events(sbml_model, model)
+
+        self.assertEqual(model.listOfEvents["e1"].trigger.expression, "t > 2**3")
+        self.assertEqual(model.listOfEvents["e1"].delay, "2**2")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,7 +17,9 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from pathlib import Path
+from unittest import mock
 import unittest
+import tempfile
 import shutil
 import os
 import example_models
@@ -113,6 +115,52 @@ class TestBuildEngine(unittest.TestCase):
         self.assertTrue(simulation_file.exists(), "Simulation executable could not be found")
         self.assertTrue(os.access(str(simulation_file), os.X_OK), "Simulation output is not executable")
 
+    def test_cached_simulation(self):
+        """
+        Ensure that with the cache enabled, an executable built from identical template definitions is reused.
+        """
+        cache_dir = Path(tempfile.mkdtemp(prefix="gillespy2_test_cache_"))
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        self.addCleanup(setattr, gillespy2, "cache_enabled", False)
+        self.addCleanup(delattr, gillespy2, "_global_cache")
+        gillespy2._global_cache = cache_dir
+        gillespy2.cache_enabled = True
+
+        first_engine = BuildEngine()
+        first_engine.prepare(self.test_model, variable=False)
+        self.addCleanup(first_engine.clean)
+        first_engine.build_simulation("ssa")
+        cached_files = list(cache_dir.joinpath("simulations").iterdir())
+        self.assertEqual(len(cached_files), 1, "Simulation executable was not cached")
+
+        second_engine = BuildEngine()
+        second_engine.prepare(self.test_model, variable=False)
+        self.addCleanup(second_engine.clean)
+        with mock.patch.object(second_engine.make, "build_simulation") as build_simulation:
+            simulation_file = second_engine.build_simulation("ssa")
+        build_simulation.assert_not_called()
+        self.assertTrue(os.access(simulation_file, os.X_OK), "Cached simulation output is not executable")
+
+        # A different simulation target must not reuse the cached executable.
+        with mock.patch.object(second_engine.make, "build_simulation") as build_simulation:
+            second_engine.build_simulation("ode")
+        build_simulation.assert_called_once()
+
+        # Edited C++ sources must not reuse an executable built from the originals.
+        source_dir = Path(tempfile.mkdtemp(prefix="gillespy2_test_src_")).joinpath("c_base")
+        self.addCleanup(shutil.rmtree, source_dir.parent, ignore_errors=True)
+        shutil.copytree(BuildEngine.cpp_dir, source_dir)
+        with mock.patch.object(BuildEngine, "cpp_dir", source_dir):
+            with mock.patch.object(second_engine.make, "build_simulation") as build_simulation:
+                second_engine.build_simulation("ssa")
+            build_simulation.assert_not_called()
+
+            with source_dir.joinpath("model.cpp").open("a") as model_source:
+                model_source.write("\n// Edited source.\n")
+            with mock.patch.object(second_engine.make, "build_simulation") as build_simulation:
+                second_engine.build_simulation("ssa")
+            build_simulation.assert_called_once()
+
 
 if __name__ == '__main__':
     unittest.main()
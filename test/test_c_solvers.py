@@ -169,6 +169,19 @@ class TestCSolvers(unittest.TestCase):
                 self.assertTrue(os.access(base_solver.build_engine.get_executable_path(), os.X_OK),
                                 "Solver executable invalid or missing at solver's construction")
 
+    def test_reaction_dependencies(self):
+        """
+        Ensure that each propensity's dependencies are the species it reads, not the species its reaction changes.
+        """
+        model = example_models.Tyson2StateOscillator()
+        template = SanitizedModel(model).get_template()
+        # X production reads Y only, while Y production reads X only.
+        self.assertEqual(template["GPY_REACTION_DEPENDENCIES"], "{{0,1},{1,0},{1,0},{0,1},{0,1}}")
+
+        results = model.run(solver=SSACSolver, seed=1)
+        self.assertTrue((results["X"] >= 0).all())
+        self.assertGreater(results["Y"][-1], 0)
+
     def test_solver_expressions(self):
         """
         Ensure that expression conversions to C++ result in (roughly) equivalent values as Python.
@@ -16,13 +16,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import re
 import sys
+import json
+import hashlib
 import unittest
+from unittest import mock
 
 sys.path.append("..")
 from example_models import *
-from gillespy2.core import Model, Reaction, Parameter, Species, Results
-from gillespy2.core.jsonify import TranslationTable
+from gillespy2.core import Model, Reaction, Parameter, Species, Results, FunctionDefinition
+from gillespy2.core import jsonify
+from gillespy2.core.jsonify import Jsonify, TranslationTable
+from gillespy2 import NumPySSASolver
 
 class TestJsonModels(unittest.TestCase):
     models = [
@@ -227,3 +233,134 @@ class TestJsonModels(unittest.TestCase):
 
         model_no_whitespace.add_reaction(reaction_no_whitespace)
         model_with_whitespace.add_reaction(reaction_with_whitespace)
+
+    def test_model_hash_direct_mutation(self):
+        """ Test that the JSON hash tracks models and their components when they are modified directly. """
+        model = MichaelisMenten()
+        model_hash = model.get_json_hash()
+        self.assertEqual(model_hash, model.get_json_hash())
+
+        model.add_species(Species(name="X", initial_value=10))
+        self.assertNotEqual(model_hash, model.get_json_hash())
+
+        for mutate in (
+            lambda model: setattr(model, "volume", 7),
+            lambda model: setattr(model.listOfSpecies["A"], "initial_value", 999),
+            lambda model: setattr(model.listOfParameters["rate1"], "expression", "0.5"),
+        ):
+            with self.subTest(mutate=mutate):
+                model_hash = model.get_json_hash()
+                mutate(model)
+                self.assertNotEqual(model_hash, model.get_json_hash())
+                self.assertNotEqual(model, MichaelisMenten())
+
+        self.assertEqual(model.get_json_hash(), model.to_anon().to_named().get_json_hash())
+
+    def test_model_hash_algorithm(self):
+        """ Test that the JSON hash is always MD5, whichever hash the equality check uses. """
+        model = MichaelisMenten()
+        model_hash = hashlib.md5(re.sub(r"\s+", "", model.to_json(encode_private=False)).encode()).hexdigest()
+        self.assertEqual(model.get_json_hash(), model_hash)
+
+        with mock.patch.object(jsonify, "_eq_hash_fn", hashlib.sha256):
+            self.assertEqual(model.get_json_hash(), model_hash)
+            table = TranslationTable(to_anon={"k1": "P_100"})
+            self.assertEqual(table, TranslationTable(to_anon={"k1": "P_100"}))
+            self.assertNotEqual(table, TranslationTable(to_anon={"k1": "P_101"}))
+
+    def test_legacy_model_json(self):
+        """ Test that models decoded from JSON written before the sanitized name counters existed can be extended. """
+        model_dict = json.loads(Example().to_json())
+        for counter in ("_species_counter", "_parameter_counter", "_reaction_counter"):
+            del model_dict[counter]
+        model = Model.from_json(json.dumps(model_dict))
+
+        model.add_species(Species(name="Sp2", initial_value=5))
+        model.add_parameter(Parameter(name="k3", expression="k1 * 2"))
+        model.add_reaction(Reaction(name="r3", reactants={"Sp2": 1}, products={}, rate="k3"))
+
+        self.assertEqual(model._listOfSpecies["Sp2"], "S1")
+        self.assertEqual(model._listOfParameters["k3"], "P1")
+        self.assertEqual(model._listOfReactions["r3"].name, "R1")
+        results = model.run(solver=NumPySSASolver)
+        self.assertIn("Sp2", results[0])
+
+    def test_translate_overlapping_names(self):
+        """ Test that names which are substrings of other names are translated independently. """
+        translation_table = TranslationTable(to_anon={"k1": "P_100", "k10": "P_101", "e5": "P_102"})
+        parameter = Parameter(name="k2", expression="k1 + k10 * 1e5 + e5")
+
+        anon_parameter = translation_table.obj_to_anon(parameter)
+        self.assertEqual(anon_parameter.expression, "P_100 + P_101 * 1e5 + P_102")
+
+        named_parameter = translation_table.obj_to_named(anon_parameter)
+        self.assertEqual(named_parameter.expression, "k1 + k10 * 1e5 + e5")
+
+    def test_translate_lists(self):
+        """ Test that values held within lists are translated. """
+        translation_table = TranslationTable(to_anon={"k1": "P_100", "S": "S_100"})
+        function = FunctionDefinition(name="f", function="k1 * S", args=["k1", "S"])
+
+        anon_function = translation_table.obj_to_anon(function)
+        self.assertEqual(anon_function.args, ["P_100", "S_100"])
+        self.assertEqual(anon_function.function_string, "P_100 * S_100")
+
+    def test_ndarray_round_trip(self):
+        """ Test that numeric arrays survive encoding as raw bytes, and that legacy list encodings still decode. """
+        import numpy
+        from gillespy2.core.jsonify import NdArrayCoder
+
+        array = numpy.array([[0.0, 1.5, numpy.nan], [3.0, 4.0, 5.0]])
+        decoded = NdArrayCoder.from_json(NdArrayCoder.to_dict(array))
+        self.assertEqual(decoded.dtype, array.dtype)
+        self.assertEqual(decoded.shape, array.shape)
+        numpy.testing.assert_array_equal(decoded, array)
+
+        decoded[0, 0] = 10
+        self.assertEqual(decoded[0, 0], 10)
+
+        legacy = NdArrayCoder.from_json({"data": [[1, 2], [3, 4]]})
+        numpy.testing.assert_array_equal(legacy, numpy.array([[1, 2], [3, 4]]))
+
+    def test_non_finite_values(self):
+        """ Test that non-finite values survive a JSON round trip in the standard encoding. """
+        species = Species(name="A", initial_value=0)
+        species.initial_value = float("inf")
+
+        species_json = species.to_json()
+        self.assertIn('\n    "', species_json)
+        self.assertIn("Infinity", species_json)
+        self.assertEqual(Species.from_json(species_json).initial_value, float("inf"))
+
+    def test_translation_table_copies_mapping(self):
+        """ Test that a translation table is unaffected by later changes to the mapping it was built from. """
+        to_anon = {"k1": "P_100"}
+        translation_table = TranslationTable(to_anon=to_anon)
+        to_anon["k2"] = "P_101"
+
+        self.assertEqual(translation_table.to_anon, {"k1": "P_100"})
+        self.assertEqual(translation_table.to_named, {"P_100": "k1"})
+        anon_parameter = translation_table.obj_to_anon(Parameter(name="k3", expression="k1 + k2"))
+        self.assertEqual(anon_parameter.expression, "P_100 + k2")
+
+    def test_from_json_decoded_values(self):
+        """ Test that already decoded values are passed through from_json() unchanged. """
+        self.assertEqual(Jsonify.from_json(["a", "b"]), ["a", "b"])
+        self.assertEqual(Jsonify.from_json([1, 2.5, None, "c"]), [1, 2.5, None, "c"])
+        self.assertEqual(Jsonify.from_json(5), 5)
+
+        species = Species.from_json([{"name": "A", "initial_value": 10}])[0]
+        self.assertIsInstance(species, Species)
+        self.assertEqual(species.initial_value, 10)
+
+    def test_equality(self):
+        """ Test that Jsonify objects compare by content, and that mutable ones are not hashable. """
+        table1 = TranslationTable(to_anon={"k1": "P_100", "S": "S_100"})
+        table2 = TranslationTable(to_anon={"k1": "P_100", "S": "S_100"})
+        table3 = TranslationTable(to_anon={"k1": "P_101", "S": "S_100"})
+
+        self.assertEqual(table1, table2)
+        self.assertNotEqual(table1, table3)
+        self.assertNotEqual(table1, "not a Jsonify object")
+        with self.assertRaises(TypeError):
+            hash(table1)
@@ -18,7 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
 from example_models import RobustModel, Example, ExampleNoTspan
-from gillespy2.core import Model, Species, Reaction, Parameter
+from gillespy2.core import Model, Species, Reaction, Parameter, RateRule, AssignmentRule, FunctionDefinition
 from gillespy2.core.gillespyError import *
 from gillespy2.core.model import export_StochSS
 import tempfile
@@ -314,6 +314,14 @@ class TestModel(unittest.TestCase):
         with self.assertRaises(ParameterError):
             parameter = Parameter(name = 'parameter')
 
+    def test_add_parameter_after_direct_edit(self):
+        model = Model()
+        model.add_parameter(Parameter(name='k1', expression=1))
+        model.listOfParameters['k1'].value = 5
+        k2 = Parameter(name='k2', expression='k1*2')
+        model.add_parameter(k2)
+        self.assertEqual(k2.value, 10.0)
+
     def test_ode_propensity(self):
         model = Model()
         rate = Parameter(name='rate', expression=0.5)
@@ -342,6 +350,81 @@ class TestModel(unittest.TestCase):
         with self.assertRaises(SpeciesError):
             sp2.set_initial_value(.5)
 
+    def test_sanitized_names_unique_after_delete(self):
+        model = Model()
+        model.add_species([Species('A', initial_value=1), Species('B', initial_value=1)])
+        model.delete_species('A')
+        model.add_species(Species('C', initial_value=1))
+        self.assertEqual(len(set(model._listOfSpecies.values())), 2)
+
+    def test_to_soa(self):
+        model = Model()
+        model.add_parameter(Parameter(name='k1', expression=0.5))
+        model.add_species([Species(name='A', initial_value=10), Species(name='B', initial_value=0)])
+        model.add_reaction(Reaction(name='r1', reactants={'A': 2}, products={'B': 1}, rate='k1'))
+        model.add_reaction(Reaction(name='r2', reactants={'B': 1}, products={}, propensity_function='k1*B'))
+        soa = model.to_soa()
+        np.testing.assert_array_equal(soa['nu'], [[-2, 1], [0, -1]])
+        np.testing.assert_array_equal(soa['k'], [0.5, np.nan])
+        np.testing.assert_array_equal(soa['reactant_csr_ptr'], [0, 1, 2])
+        np.testing.assert_array_equal(soa['reactant_csr_idx'], [0, 1])
+        np.testing.assert_array_equal(soa['reactant_csr_val'], [2, 1])
+        np.testing.assert_array_equal(soa['x0'], [10, 0])
+
+    def test_to_soa_expression_rate(self):
+        model = Model()
+        model.add_parameter(Parameter(name='k1', expression=0.5))
+        model.add_species(Species(name='A', initial_value=10))
+        model.add_reaction(Reaction(name='r1', reactants={'A': 1}, products={}, rate='k1*2'))
+        model.add_reaction(Reaction(name='r2', reactants={'A': 1}, products={}, rate='3'))
+        np.testing.assert_array_equal(model.to_soa()['k'], [1.0, 3.0])
+
+    def test_stoich_matrix(self):
+        model = Model()
+        model.add_parameter(Parameter(name='k1', expression=1.0))
+        model.add_species([Species(name='A', initial_value=10), Species(name='B', initial_value=0)])
+        reaction = model.add_reaction(Reaction(name='r1', reactants={'A': 1}, products={'B': 1}, rate='k1'))
+        np.testing.assert_array_equal(model.stoich_matrix, [[-1, 1]])
+
+        model.add_reaction(Reaction(name='r2', reactants={'B': 1}, products={}, rate='k1'))
+        np.testing.assert_array_equal(model.stoich_matrix, [[-1, 1], [0, -1]])
+        np.testing.assert_array_equal(model.reactant_power_matrix, [[1, 0], [0, 1]])
+
+        # Reactions edited in place are reflected without any further call.
+        reaction.reactants[model.listOfSpecies['A']] = 2
+        np.testing.assert_array_equal(model.stoich_matrix, [[-2, 1], [0, -1]])
+        np.testing.assert_array_equal(model.to_soa()['nu'], [[-2, 1], [0, -1]])
+
+    def test_duplicate_rule_variables(self):
+        model = Model()
+        species = model.add_species(Species(name='A', initial_value=10))
+        model.add_species(Species(name='B', initial_value=0))
+        model.add_rate_rule(RateRule(name='rr1', variable='A', formula='-A'))
+        with self.assertRaises(ParameterError):
+            model.add_rate_rule(RateRule(name='rr2', variable=species, formula='A'))
+        with self.assertRaises(ParameterError):
+            model.add_assignment_rule(AssignmentRule(name='ar1', variable='A', formula='1'))
+        model.add_assignment_rule(AssignmentRule(name='ar2', variable='B', formula='A'))
+
+        model.delete_rate_rule('rr1')
+        model.add_assignment_rule(AssignmentRule(name='ar1', variable='A', formula='1'))
+
+        # Rules removed from the public dicts directly no longer block their variables.
+        del model.listOfAssignmentRules['ar1']
+        model.add_rate_rule(RateRule(name='rr3', variable='A', formula='-A'))
+
+    def test_delete_unsanitized_components(self):
+        model = Model()
+        model.add_species(Species(name='A', initial_value=10))
+        model.add_assignment_rule(AssignmentRule(name='ar1', variable='A', formula='1'))
+        model.add_function_definition(FunctionDefinition(name='f', function='x', args=['x']))
+        model.delete_assignment_rule('ar1')
+        model.delete_function_definition('f')
+        self.assertEqual(len(model.listOfAssignmentRules), 0)
+        self.assertEqual(len(model.listOfFunctionDefinitions), 0)
+        with self.assertRaises(KeyError):
+            model.delete_assignment_rule('ar1')
+
     def test_robust_model(self):
         try:
             model = RobustModel()
@@ -24,7 +24,46 @@ from gillespy2 import TauLeapingSolver
 
 class TestBasicTauLeapingSolver(unittest.TestCase):
     model = Example()
-    
+
+    def test_tau_leap_ensemble(self):
+        from example_models import Dimerization
+        from gillespy2.solvers.utilities.solverutils import numpy_tau_leap_ensemble
+        model = Dimerization()
+        timeline = np.linspace(0, 100, 6)
+        trajectories = numpy_tau_leap_ensemble(model, timeline, 100, 0.05, seed=1)
+        self.assertEqual(trajectories.shape, (100, 6, 2))
+        np.testing.assert_array_equal(trajectories[:, 0], [[30, 0]] * 100)
+        # Two monomers form each dimer, so the total number of monomer units is conserved.
+        np.testing.assert_array_equal(trajectories[:, :, 0] + 2 * trajectories[:, :, 1], 30)
+        self.assertTrue((trajectories[:, -1, 1] > 0).all())
+
+    def test_tau_leap_ensemble_dtype(self):
+        from example_models import Dimerization
+        from gillespy2.solvers.utilities.solverutils import numpy_tau_leap_ensemble
+        model = Dimerization()
+        timeline = np.linspace(0, 100, 6)
+        trajectories = numpy_tau_leap_ensemble(model, timeline, 10, 0.05, seed=1)
+        narrow = numpy_tau_leap_ensemble(model, timeline, 10, 0.05, seed=1, dtype=np.float32)
+        self.assertEqual(narrow.dtype, np.float32)
+        np.testing.assert_array_equal(narrow, trajectories)
+
+    def test_tau_leap_ensemble_volume(self):
+        from gillespy2 import Model, Species, Parameter, Reaction
+        from gillespy2.core.gillespyError import ModelError
+        from gillespy2.solvers.utilities.solverutils import numpy_tau_leap_ensemble
+        model = Model(volume=100)
+        model.add_species([Species(name='A', initial_value=100), Species(name='B', initial_value=0)])
+        model.add_parameter(Parameter(name='k', expression=1))
+        reaction = Reaction(name='r', reactants={'A': 2}, products={'B': 1}, rate='k')
+        model.add_reaction(reaction)
+        trajectories = numpy_tau_leap_ensemble(model, np.array([0, 0.1]), 2000, 0.1, seed=1)
+        # The propensity of 2A -> B is 0.5 * k * A * (A - 1) / vol, so 4.95 firings are expected in one leap.
+        self.assertAlmostEqual(trajectories[:, -1, 1].mean(), 4.95, delta=0.25)
+
+        reaction.reactants[model.listOfSpecies['A']] = 3
+        with self.assertRaises(ModelError):
+            numpy_tau_leap_ensemble(model, np.array([0, 0.1]), 10, 0.1, seed=1)
+
 
 if __name__ == '__main__':
     unittest.main()
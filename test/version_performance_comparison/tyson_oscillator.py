@@ -122,8 +122,8 @@ if __name__ == '__main__':
     # The results of the simulation are the output of "run".
     import time
     from gillespy2 import SSACSolver
-    tic = time.time()
+    tic = time.perf_counter()
     for _ in range(10):
         tyson_model = Tyson2StateOscillator()
         trajectories = tyson_model.run(solver=SSACSolver)
-    print((time.time() - tic)/10)
+    print((time.perf_counter() - tic)/10)